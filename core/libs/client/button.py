@@ -10,11 +10,12 @@ import select # Import the select module for non-blocking I/O
 
 
 from inputBox import InputBox
+from textCache import render_text
 
 # --- Constants ---
 WIDTH, HEIGHT = 1000, 650
 FPS = 60
-HEADER_LENGTH = 10 # Must match server's HEADER_LENGTH
+HEADER_LENGTH = 4 # Must match server's HEADER_LENGTH
 
 # Colors
 BG_COLOR = (25, 25, 35)
@@ -32,7 +33,8 @@ ASSASSIN_CARD = (30, 30, 30)
 REVEALED_TEXT_COLOR = (255, 255, 255)
 CARD_BORDER_COLOR = (80, 80, 80)
 
-pygame.init()
+pygame.display.init()
+pygame.font.init()
 
 # Fonts
 FontName = 'Comic Sans'
@@ -62,28 +64,37 @@ class Button:
         self.shadow_offset = 3
         self.shadow_color = (20, 20, 25)
         self.is_enabled = is_enabled
+        # (background, text) colors for the disabled, normal and hovered states
+        self._states = ((self.disabled_color, self.disabled_text_color),
+                        (self.base_color, self.text_color),
+                        (self.hover_color, self.text_color))
+        self._faces = {} # (state, text, size) -> pre-rendered button face including its shadow
+
+    def _render_face(self, state):
+        """Renders the shadow, rounded background and label for one state to a surface."""
+        bg_color, text_color = self._states[state]
+        width, height = self.rect.size
+        face = pygame.Surface((width + self.shadow_offset, height + self.shadow_offset), pygame.SRCALPHA)
+        body_rect = pygame.Rect(0, 0, width, height)
+        if state: # Disabled buttons have no shadow
+            pygame.draw.rect(face, self.shadow_color, body_rect.move(self.shadow_offset, self.shadow_offset), border_radius=self.border_radius)
+        pygame.draw.rect(face, bg_color, body_rect, border_radius=self.border_radius)
+
+        text_surface = render_text(self.font, self.text, text_color)
+        face.blit(text_surface, text_surface.get_rect(center=body_rect.center))
+        if pygame.display.get_surface() is not None: # convert_alpha needs a display mode
+            face = face.convert_alpha()
+        return face
 
     def draw(self, screen, mouse_pos):
         """Draws the button on the screen."""
-        current_bg_color = self.base_color
-        current_text_color = self.text_color
-
-        if not self.is_enabled:
-            current_bg_color = self.disabled_color
-            current_text_color = self.disabled_text_color
-        elif self.rect.collidepoint(mouse_pos):
-            current_bg_color = self.hover_color
-        
-        if self.is_enabled:
-            shadow_rect = pygame.Rect(self.rect.x + self.shadow_offset, self.rect.y + self.shadow_offset,
-                                      self.rect.width, self.rect.height)
-            pygame.draw.rect(screen, self.shadow_color, shadow_rect, border_radius=self.border_radius)
-
-        pygame.draw.rect(screen, current_bg_color, self.rect, border_radius=self.border_radius)
-        
-        text_surface = self.font.render(self.text, True, current_text_color)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        state = (2 if self.rect.collidepoint(mouse_pos) else 1) if self.is_enabled else 0
+        key = (state, self.text, self.rect.size)
+        face = self._faces.get(key)
+        if face is None: # First draw in this state, or the text/size changed
+            face = self._render_face(state)
+            self._faces[key] = face
+        screen.blit(face, self.rect)
 
     def handle_event(self, event):
         """Handles Pygame events for the button."""
@@ -101,3 +112,7 @@ class Button:
         """Enables or disables the button."""
         self.is_enabled = enabled
 
+    def set_text(self, text):
+        """Changes the button label. Faces are cached per label, so switching between labels renders each only once."""
+        self.text = text
+
@@ -6,15 +6,42 @@ import time
 import random
 import sys
 import traceback # For better error debugging
-import select # Import the select module for non-blocking I/O
+import functools
+import queue
+import struct
+import zlib
+import selectors # Persistent readiness notification for the server socket
 
 from inputBox import InputBox
 from button import Button
+from textCache import render_text
+
+try:
+    import orjson # Much faster JSON encode/decode, returns bytes directly
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+    JSON_DECODE_ERRORS = (orjson.JSONDecodeError, json.JSONDecodeError)
+else:
+    def _dumps(message):
+        return json.dumps(message).encode('utf-8')
+
+    def _loads(data):
+        return json.loads(str(data, 'utf-8'))
+
+    JSON_DECODE_ERRORS = (json.JSONDecodeError,)
 
 # --- Constants ---
 WIDTH, HEIGHT = 1000, 650
 FPS = 60
-HEADER_LENGTH = 10 # Must match server's HEADER_LENGTH
+HEADER_STRUCT = struct.Struct("!I") # Message length as a 4-byte big-endian unsigned int, must match the server
+HEADER_LENGTH = HEADER_STRUCT.size
+COMPRESSED_FLAG = 0x80000000 # High bit of the length header marks a zlib-compressed body, must match the server
+RECV_BUFFER_SIZE = 65536 # Size of the reusable receive buffer
+DEBUG_NET = False # Log every outgoing message, far too noisy for normal play
 
 # Colors
 BG_COLOR = (25, 25, 35)
@@ -31,8 +58,16 @@ INNOCENT_CARD = (120, 120, 120)
 ASSASSIN_CARD = (30, 30, 30)
 REVEALED_TEXT_COLOR = (255, 255, 255)
 CARD_BORDER_COLOR = (80, 80, 80)
+HIDDEN_CARD = (100, 100, 100) # Face of a card whose color this client can't see
+CARD_FACE_COLORS = {"red": RED_CARD, "blue": BLUE_CARD, "innocent": INNOCENT_CARD, "assassin": ASSASSIN_CARD, None: HIDDEN_CARD}
+
+# Card geometry on the game board
+CARD_WIDTH, CARD_HEIGHT = 170, 65
+CARD_MARGIN = 10
 
-pygame.init()
+# Only the subsystems the client uses; pygame.init() would also open the audio device and joysticks
+pygame.display.init()
+pygame.font.init()
 
 # Fonts
 FontName = 'Comic Sans'
@@ -48,6 +83,10 @@ SERVER_PORT = 5555
 # --- Codenames Client Class ---
 class CodenamesClient:
     """Manages the Codenames game client, including UI and network communication."""
+    # Display forms of the assigned team/role, kept in sync by the my_assigned_* setters
+    _my_team_label = "Neutral"
+    _my_role_label = "Spectator"
+
     def __init__(self):
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Codenames Lobby & Game")
@@ -59,20 +98,32 @@ class CodenamesClient:
         self.logged_in = False
         self.username = ""
         self.client_fileno = None # This client's socket file descriptor
+        self._recv_buf = bytearray(RECV_BUFFER_SIZE) # Reused by _receive_message for every recv_into
+        self._rx_pending = bytearray() # Received bytes not yet parsed into a whole message
+        self._sel = selectors.DefaultSelector() # Server socket is registered once on connect
+        self._send_lock = threading.Lock() # One sender at a time so frames never interleave
+        self._state_lock = threading.Lock() # Serializes _reset_connection_state across threads
+        self._msg_queue = queue.SimpleQueue() # Messages from the listener thread, applied by run() before drawing
 
         self.lobby_players = [] # List of player names in lobby
         self.lobby_rooms = []   # List of room dicts in lobby
-        self.lobby_chat = []    # List of chat messages
+        self._rooms_by_id = {}  # Same room dicts keyed by room id
+        self.lobby_chat = []    # List of chat messages (the server keeps at most 50)
+        self.lobby_chat_last = "" # Newest chat message, the only one the lobby shows
 
         self.current_room_id = None
         self.current_room_owner_fileno = None # Fileno of the owner of the current room
 
         # UI Elements
         self._init_ui_elements()
+        self._init_card_templates()
 
         # Game state
         self.game_active = False
         self.game_board = [] # List of {"word": str, "color": str, "revealed": bool}
+        self._card_word_surfaces = None # ((hidden, revealed) word surfaces, word position) per card, rebuilt lazily for a new board
+        self._cached_board_words = () # Words the cached surfaces were rendered for
+        self._last_game_state = None # Last game_state_update applied, identical repeats are skipped
         self.red_score = 0
         self.blue_score = 0
         self.current_turn = None # "red" or "blue"
@@ -100,18 +151,88 @@ class CodenamesClient:
         self.listen_thread = None
         self.game_start_requested = False # Flag to avoid multiple start requests
 
+        # Static lobby layer, re-rendered only when the lobby contents change
+        self._lobby_bg_surface = None
+        self._lobby_bg_dirty = True
+        self._dirty_rects = None # Screen areas to update this frame, None means the whole window
+        self._dirty = True # Something changed since the last drawn frame
+        self._last_mouse = None # Mouse position of the last drawn frame, for hover redraws
+        self._prev_card_state = None # (face, revealed) per card as last drawn, None forces a full game repaint
+        self._can_guess = False # Set by _draw_game while this client is an operative whose team may guess
+        self._game_bg_surface = None # Static game layer (panels, room and username labels)
+        self._game_bg_key = None # (room id, username) the static game layer was rendered for
+        self._label_surfaces = {} # slot -> (text, color, surface) for labels that change only on server updates
+        # Fixed prompts rendered once up front; they are drawn on most idle frames
+        self._prompt_surfaces = {text: render_text(FONT_MEDIUM, text, color) for text, color in (
+            ("Players in Room:", TEXT_COLOR),
+            ("Choose your team:", TEXT_COLOR),
+            ("No team chosen yet.", TEXT_COLOR),
+            ("Waiting for Spymaster's clue...", TEXT_COLOR),
+            ("It's your turn to give a clue!", HIGHLIGHT_COLOR),
+            ("Waiting for opponent's turn...", TEXT_COLOR))}
+
+        # Message type -> handler, used by _handle_message
+        self._handlers = {
+            "lobby_update": self._on_lobby_update,
+            "game_state_update": self._on_game_state_update,
+            "game_state_delta": self._on_game_state_delta,
+            "room_created": self._on_room_created,
+            "room_joined": self._on_room_joined,
+            "room_left": self._on_room_left,
+            "team_set_ack": self._on_team_set_ack,
+            "game_start_ack": self._on_game_start_ack,
+            "error": self._on_error,
+        }
+
+    @property
+    def my_assigned_team(self):
+        return self._my_assigned_team
+
+    @my_assigned_team.setter
+    def my_assigned_team(self, team):
+        self._my_assigned_team = team
+        self._my_team_label = team.capitalize() if team else "Neutral"
+        self._role_color = CARD_FACE_COLORS[team] if team in ("red", "blue") else TEXT_COLOR
+        self._update_role_label()
+
+    @property
+    def my_assigned_role(self):
+        return self._my_assigned_role
+
+    @my_assigned_role.setter
+    def my_assigned_role(self, role):
+        self._my_assigned_role = role
+        self._my_role_label = role.capitalize() if role else "Spectator"
+        self._update_role_label()
+
+    def _update_role_label(self):
+        """Rebuilds the "You role: ..." text shown in the game info bar."""
+        self._role_label = f"You role: {self._my_team_label} {self._my_role_label}"
+
     def _init_ui_elements(self):
         """Initializes all UI elements."""
         self.name_input = InputBox(WIDTH // 2 - 100, HEIGHT // 2 - 20, 200, 40, placeholder="Enter your name")
         self.connect_button = Button(WIDTH // 2 - 75, HEIGHT // 2 + 40, 150, 40, "Connect", self._try_connect)
 
-        self.create_room_input = InputBox(50, HEIGHT - 60, 200, 40, placeholder="New room name")
-        self.create_room_button = Button(260, HEIGHT - 60, 120, 40, "Create Room", self._send_create_room)
-        self.chat_input = InputBox(400, HEIGHT - 60, 350, 40, placeholder="Type chat message")
-        self.send_chat_button = Button(760, HEIGHT - 60, 80, 40, "Send", self._send_chat_message)
+        # Lobby layout, fixed since WIDTH/HEIGHT are constants
+        self.player_panel_rect = pygame.Rect(20, 70, 250, HEIGHT - 250)
+        self.room_panel_rect = pygame.Rect(290, 70, WIDTH - 310, HEIGHT - 250)
+        self.chat_panel_rect = pygame.Rect(20, HEIGHT - 170, WIDTH - 40, 150)
+
+        # Game screen layout
+        self.info_bar_rect = pygame.Rect(20, 20, WIDTH - 40, 100)
+        self.action_bar_rect = pygame.Rect(20, HEIGHT - 110, WIDTH - 40, 80)
+
+        self.create_room_input = InputBox(self.room_panel_rect.x + 10, self.room_panel_rect.y + 50, 200, 40, placeholder="New room name")
+        self.create_room_button = Button(self.create_room_input.rect.right + 10, self.room_panel_rect.y + 50, 120, 40, "Create Room", self._send_create_room)
+        self.chat_input = InputBox(self.chat_panel_rect.x + 10, self.chat_panel_rect.y + 90, self.chat_panel_rect.width - 120, 40, placeholder="Type chat message")
+        self.send_chat_button = Button(self.chat_input.rect.right + 5, self.chat_panel_rect.y + 90, 80, 40, "Send", self._send_chat_message)
         
         self.refresh_lobby_button = Button(WIDTH - 120, 30, 100, 35, "Refresh", self._send_lobby_refresh_request, font=FONT_SMALL)
 
+        # Join buttons for the room list, one per row, reused every frame instead of rebuilt (see _join_button)
+        self.join_buttons = []
+
         # Team selection buttons
         self.red_team_button = Button(WIDTH // 2 - 120, HEIGHT // 2 - 50, 100, 40, "Join Red", 
                                       lambda: self._send_set_team("red"), base_color=RED_CARD, hover_color=(220, 80, 80))
@@ -123,9 +244,45 @@ class CodenamesClient:
         self.send_clue_button = Button(300, HEIGHT - 100, 100, 40, "Send Clue", self._send_clue)
         self.end_turn_button = Button(WIDTH - 150, HEIGHT - 100, 120, 40, "End Turn", self._send_end_turn)
 
-    def _draw_text(self, text, font, color, x, y, center=True):
-        """Helper to draw text on the screen."""
-        text_surface = font.render(text, True, color)
+        # Room lobby and game-over buttons, repositioned by the draw methods
+        self.start_game_btn = Button(WIDTH // 2 - 100, 0, 200, 50, "Start Game", self._send_start_game_request)
+        self.leave_room_btn = Button(WIDTH // 2 - 100, 0, 200, 50, "Leave Room", self._send_leave_room)
+        self.back_to_lobby_btn = Button(WIDTH // 2 - 100, HEIGHT // 2 - 30, 200, 50, "Back to Lobby", self._send_leave_room, font=FONT_MEDIUM)
+
+    def _init_card_templates(self):
+        """Pre-renders one card face (rounded rect + border) per card color and lays out the 5x5 board."""
+        start_x = (WIDTH - (5 * CARD_WIDTH + 4 * CARD_MARGIN)) // 2
+        start_y = self.info_bar_rect.bottom + 20
+        self._card_rects = [pygame.Rect(start_x + (i % 5) * (CARD_WIDTH + CARD_MARGIN),
+                                        start_y + (i // 5) * (CARD_HEIGHT + CARD_MARGIN),
+                                        CARD_WIDTH, CARD_HEIGHT)
+                            for i in range(25)]
+
+        self._card_templates = {}
+        card_rect = pygame.Rect(0, 0, CARD_WIDTH, CARD_HEIGHT)
+        for color_name, face_color in CARD_FACE_COLORS.items():
+            face = pygame.Surface(card_rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(face, face_color, card_rect, border_radius=8)
+            pygame.draw.rect(face, CARD_BORDER_COLOR, card_rect, 2, border_radius=8)
+            self._card_templates[color_name] = face.convert_alpha()
+
+    def _draw_text(self, text, font, color, x, y, center=True, surface=None):
+        """Helper to draw text on the screen (or on the given surface)."""
+        text_surface = render_text(font, text, color)
+        text_rect = text_surface.get_rect()
+        if center:
+            text_rect.center = (x, y)
+        else:
+            text_rect.topleft = (x, y)
+        (surface or self.screen).blit(text_surface, text_rect)
+
+    def _draw_label(self, slot, text, font, color, x, y, center=True):
+        """Like _draw_text, but keeps the last surface per slot so an unchanged label skips even the cache lookup."""
+        cached = self._label_surfaces.get(slot)
+        if cached is None or cached[0] != text or cached[1] != color:
+            cached = (text, color, render_text(font, text, color))
+            self._label_surfaces[slot] = cached
+        text_surface = cached[2]
         text_rect = text_surface.get_rect()
         if center:
             text_rect.center = (x, y)
@@ -133,57 +290,61 @@ class CodenamesClient:
             text_rect.topleft = (x, y)
         self.screen.blit(text_surface, text_rect)
 
+    def _draw_prompt(self, text, x, y):
+        """Blits one of the pre-rendered fixed prompts centered on (x, y)."""
+        text_surface = self._prompt_surfaces[text]
+        self.screen.blit(text_surface, (x - text_surface.get_width() // 2, y - text_surface.get_height() // 2))
+
     def _send_message(self, message):
         """Sends a JSON message with a fixed-size header to the server."""
         if self.connected and self.client:
             try:
-                json_message = json.dumps(message)
-                message_header = f"{len(json_message):<{HEADER_LENGTH}}".encode('utf-8')
-                self.client.sendall(message_header + json_message.encode('utf-8'))
-                print(f"[CLIENT] messageSent message_header: {message_header.decode('utf-8')}")
-                print(f"[CLIENT] messageSent json_message: {json_message}")
-                print(f"[CLIENT] messageSent json_messageEncode: {json_message.encode('utf-8')}")
-                print(f"[CLIENT] messageSent type: {message.get('type')}")
+                payload = _dumps(message)
+                message_header = HEADER_STRUCT.pack(len(payload))
+                with self._send_lock:
+                    self.client.sendall(message_header + payload) # Header and body in a single send
+                if DEBUG_NET:
+                    print(f"[CLIENT] messageSent type: {message.get('type')} ({len(payload)} bytes)")
             except Exception as e:
                 print(f"[CLIENT ERROR] Error sending message: {e}")
                 self._reset_connection_state()
 
     def _receive_message(self):
-        """Receives a JSON message with a fixed-size header from the server."""
-        try:
-            message_header = self.client.recv(HEADER_LENGTH)
-            if not len(message_header):
-                return None # Server disconnected
-
-            message_length = int(message_header.decode('utf-8').strip())
-            full_message = b''
-            while len(full_message) < message_length:
-                chunk = self.client.recv(message_length - len(full_message))
-                if not chunk:
-                    return None # Server disconnected during message receive
-                full_message += chunk
-            
-            if not full_message: # Handle case where chunk was empty and loop ended
-                return None
-
-            message = json.loads(full_message.decode('utf-8'))
+        """Receives a JSON message with a fixed-size header from the server.
 
-
-            #  To see the receive_messages
-            # print(f"[CLIENT] receive_message message_header: {message_header.decode('utf-8')}")
-            # print(f"[CLIENT] receive_message full_message: {full_message.decode('utf-8')}")
-            # print(f"[CLIENT] receive_message message: {message}")
-            # print(f"[CLIENT] receive_message type: {message.get('type')}")
-
-
-
-
-            return message
-
-        except ValueError:
-            print(f"[CLIENT ERROR] Malformed header from server.")
-            return None
-        except json.JSONDecodeError:
+        Partial frames are kept in self._rx_pending between calls, so on the non-blocking
+        socket this returns "NO_DATA" until a whole message has arrived without losing bytes.
+        """
+        try:
+            while True:
+                pending = self._rx_pending
+                if len(pending) >= HEADER_LENGTH:
+                    (header,) = HEADER_STRUCT.unpack_from(pending)
+                    message_length = header & ~COMPRESSED_FLAG
+                    frame_end = HEADER_LENGTH + message_length
+                    if len(pending) >= frame_end:
+                        try:
+                            if not message_length: # Empty body, nothing to decode
+                                continue
+                            with memoryview(pending) as view, view[HEADER_LENGTH:frame_end] as body:
+                                message = _loads(zlib.decompress(body) if header & COMPRESSED_FLAG else body)
+                        finally:
+                            del pending[:frame_end] # Consume the frame even if it failed to decode
+
+                        #  To see the receive_messages
+                        # print(f"[CLIENT] receive_message message: {message}")
+                        # print(f"[CLIENT] receive_message type: {message.get('type')}")
+
+                        return message
+
+                # Need more bytes: receive into the reusable buffer and append to the pending data
+                nbytes = self.client.recv_into(self._recv_buf)
+                if not nbytes:
+                    return None # Server disconnected
+                with memoryview(self._recv_buf) as view, view[:nbytes] as chunk:
+                    pending += chunk
+
+        except JSON_DECODE_ERRORS:
             print(f"[CLIENT ERROR] Malformed JSON from server.")
             return None
         except BlockingIOError: # Catch this specific error for non-blocking sockets
@@ -201,8 +362,10 @@ class CodenamesClient:
 
         try:
             self.client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) # Don't let Nagle hold back small messages
             self.client.connect((SERVER_HOST, SERVER_PORT))
             self.client.setblocking(False) # Set to non-blocking for event loop
+            self._sel.register(self.client, selectors.EVENT_READ)
             self.connected = True
             
             # Send join message immediately upon connection
@@ -211,32 +374,33 @@ class CodenamesClient:
             self.client_fileno = self.client.fileno() # Get client's socket fileno
             print(f"[CLIENT] Connected to server as {self.username} (socket {self.client_fileno}).")
 
-            self.listen_thread = threading.Thread(target=self._listen_server, daemon=True)
+            self.listen_thread = threading.Thread(target=self._listen_server, args=(self.client,), daemon=True)
             self.listen_thread.start()
             self.logged_in = True # Assume login success after sending join, server will validate
         except Exception as e:
             print(f"[CLIENT] Connection failed: {e}")
             self._reset_connection_state()
 
-    def _listen_server(self):
-        """Listens for messages from the server."""
-        while self.running:
+    def _listen_server(self, sock):
+        """Listens for messages from the server until sock is closed or replaced."""
+        while self.running and self.client is sock:
             try:
-                # Use select to check if the socket is readable before attempting to recv
-                readable, _, _ = select.select([self.client], [], [], 0.05) # Small timeout
-                if self.client in readable:
+                # Block until the socket is readable; the timeout only lets us notice self.running
+                events = self._sel.select(timeout=0.5)
+                if not events:
+                    continue
+
+                # Drain every message already buffered before going back to the selector
+                while True:
                     message = self._receive_message()
-                    if message is None: # Server disconnected or error during receive
-                        print("[CLIENT] Server disconnected or error during receive.")
-                        self._reset_connection_state()
+                    if message is None or message == "NO_DATA":
                         break
-                    elif message == "NO_DATA": # No data available yet, continue loop
-                        continue
-                    
-                    self._handle_message(message)
-                else:
-                    # No data to read, continue checking self.running and re-select
-                    pass
+                    self._msg_queue.put(message)
+
+                if message is None: # Server disconnected or error during receive
+                    print("[CLIENT] Server disconnected or error during receive.")
+                    self._reset_connection_state()
+                    break
             except Exception as e:
                 print(f"[CLIENT] Error in listen_server: {e}\n{traceback.format_exc()}")
                 self._reset_connection_state()
@@ -247,101 +411,134 @@ class CodenamesClient:
         mtype = message.get("type")
         # print(f"[CLIENT_DEBUG] handle_message called for type: {mtype}") # Too verbose
 
-        if mtype == "lobby_update":
-            self.lobby_players = message.get("players", [])
-            self.lobby_rooms = message.get("rooms", [])
-            self.lobby_chat = message.get("chat", [])
-            # print("[CLIENT] Lobby updated.")
-            
-            # Update current_room_owner_fileno from lobby_update if in a room
-            if self.current_room_id:
-                for room_info in self.lobby_rooms:
-                    if room_info['id'] == self.current_room_id:
-                        self.current_room_owner_fileno = room_info.get('owner_fileno')
-                        # print(f"[CLIENT_DEBUG] Updated current_room_owner_fileno from lobby_update: {self.current_room_owner_fileno}")
-                        break
-            
-            # Reset game_start_requested if game was supposed to start but isn't
-            if self.game_start_requested and not any(r['game_in_progress'] for r in self.lobby_rooms if r['id'] == self.current_room_id):
-                self.game_start_requested = False 
-
-        elif mtype == "game_state_update":
-            # print(f"[RECV] Game state update: {message}")
-            self.game_board = message["board"]
-            self.red_score = message["red_score"]
-            self.blue_score = message["blue_score"]
-            self.current_turn = message["turn"]
-            self.clue_word = message["clue_word"]
-            self.clue_number = message["clue_number"]
-            self.guesses_made = message["guesses_made"]
-            self.game_over = message["game_over"]
-            self.winner = message["winner"]
-            
-            # Update role assignments from server
-            self.is_spymaster = message["is_spymaster"]
-            self.spymaster_red_fileno = message["spymaster_red"]
-            self.spymaster_blue_fileno = message["spymaster_blue"]
-            self.operative_red_filenos = message["operative_red"]
-            self.operative_blue_filenos = message["operative_blue"]
-
-            # Update client's own assigned team and role
-            self.my_assigned_team = message.get("my_team")
-            self.my_assigned_role = message.get("my_role")
-            
-            # Debug prints for role and turn
-            # print(f"[CLIENT_DEBUG] Client Fileno: {self.client_fileno}")
-            # print(f"[CLIENT_DEBUG] Red Spymaster Fileno: {self.spymaster_red_fileno}")
-            # print(f"[CLIENT_DEBUG] Blue Spymaster Fileno: {self.spymaster_blue_fileno}")
-            # print(f"[CLIENT_DEBUG] Is this client a Spymaster? {self.is_spymaster}")
-            # print(f"[CLIENT_DEBUG] Current Turn: {self.current_turn}")
-            # print(f"[CLIENT_DEBUG] Operative Red: {self.operative_red_filenos}")
-            # print(f"[CLIENT_DEBUG] Operative Blue: {self.operative_blue_filenos}")
-            # print(f"[CLIENT_DEBUG] My Assigned Team: {self.my_assigned_team}, My Assigned Role: {self.my_assigned_role}")
-            
-            self.game_active = True
-            self.game_start_requested = False # Reset this flag
-            # print("[CLIENT] Game state updated. Switching to game view.")
+        handler = self._handlers.get(mtype)
+        if handler:
+            handler(message)
+            self._dirty = True
+        else:
+            print(f"[CLIENT] Unknown message type: {mtype}")
+
+    def _on_lobby_update(self, message):
+        self.lobby_players = message.get("players", [])
+        self.lobby_rooms = message.get("rooms", [])
+        self._rooms_by_id = {r['id']: r for r in self.lobby_rooms}
+        self.lobby_chat = message.get("chat") or []
+        self.lobby_chat_last = self.lobby_chat[-1] if self.lobby_chat else ""
+        self._lobby_bg_dirty = True
+        # print("[CLIENT] Lobby updated.")
         
-        elif mtype == "room_created":
-            room_id = message.get("room_id")
-            room_name = message.get("name")
-            owner_fileno = message.get("owner_fileno")
-            print(f"[CLIENT] Room '{room_name}' (ID: {room_id}) created!")
-            self.current_room_id = room_id
-            self.current_room_owner_fileno = owner_fileno
-            self.game_active = False # Not active until game starts
-            self.my_chosen_team = None # Reset chosen team when entering a new room
-
-        elif mtype == "room_joined":
-            room_id = message.get("room_id")
-            owner_fileno = message.get("owner_fileno")
-            print(f"[CLIENT] Joined room: {room_id}")
-            self.current_room_id = room_id
-            self.current_room_owner_fileno = owner_fileno
-            self.game_active = False
-            self.my_chosen_team = None # Reset chosen team when entering a new room
+        room_info = self._rooms_by_id.get(self.current_room_id)
 
-        elif mtype == "room_left":
-            print("[CLIENT] Left room.")
-            self.current_room_id = None
-            self.current_room_owner_fileno = None
-            self.game_active = False # Game is no longer active for this client
-            self.my_chosen_team = None # Reset chosen team when leaving room
-            self.my_assigned_team = None
-            self.my_assigned_role = None
+        # Update current_room_owner_fileno from lobby_update if in a room
+        if room_info:
+            self.current_room_owner_fileno = room_info.get('owner_fileno')
+            # print(f"[CLIENT_DEBUG] Updated current_room_owner_fileno from lobby_update: {self.current_room_owner_fileno}")
+        
+        # Reset game_start_requested if game was supposed to start but isn't
+        if self.game_start_requested and not (room_info and room_info['game_in_progress']):
+            self.game_start_requested = False 
+
+    def _on_game_state_update(self, message):
+        # print(f"[RECV] Game state update: {message}")
+        if message == self._last_game_state:
+            return # Nothing changed since the previous update
+        self._last_game_state = message
+
+        self.game_board = message["board"]
+        board_words = tuple(card["word"] for card in self.game_board)
+        if board_words != self._cached_board_words: # Only a new board needs its words rendered again
+            self._cached_board_words = board_words
+            self._card_word_surfaces = None
+        self.red_score = message["red_score"]
+        self.blue_score = message["blue_score"]
+        self.current_turn = message["turn"]
+        self.clue_word = message["clue_word"]
+        self.clue_number = message["clue_number"]
+        self.guesses_made = message["guesses_made"]
+        self.game_over = message["game_over"]
+        self.winner = message["winner"]
+        
+        # Update role assignments from server
+        self.is_spymaster = message["is_spymaster"]
+        self.spymaster_red_fileno = message["spymaster_red"]
+        self.spymaster_blue_fileno = message["spymaster_blue"]
+        self.operative_red_filenos = message["operative_red"]
+        self.operative_blue_filenos = message["operative_blue"]
+
+        # Update client's own assigned team and role
+        self.my_assigned_team = message.get("my_team")
+        self.my_assigned_role = message.get("my_role")
+        
+        # Debug prints for role and turn
+        # print(f"[CLIENT_DEBUG] Client Fileno: {self.client_fileno}")
+        # print(f"[CLIENT_DEBUG] Red Spymaster Fileno: {self.spymaster_red_fileno}")
+        # print(f"[CLIENT_DEBUG] Blue Spymaster Fileno: {self.spymaster_blue_fileno}")
+        # print(f"[CLIENT_DEBUG] Is this client a Spymaster? {self.is_spymaster}")
+        # print(f"[CLIENT_DEBUG] Current Turn: {self.current_turn}")
+        # print(f"[CLIENT_DEBUG] Operative Red: {self.operative_red_filenos}")
+        # print(f"[CLIENT_DEBUG] Operative Blue: {self.operative_blue_filenos}")
+        # print(f"[CLIENT_DEBUG] My Assigned Team: {self.my_assigned_team}, My Assigned Role: {self.my_assigned_role}")
+        
+        self.game_active = True
+        self.game_start_requested = False # Reset this flag
+        # print("[CLIENT] Game state updated. Switching to game view.")
+
+    def _on_game_state_delta(self, message):
+        """Applies the changed fields and cards on top of the last full game state."""
+        if self._last_game_state is None:
+            return # No snapshot to patch yet, the server sends a full one periodically
+        state = dict(self._last_game_state)
+        state.update(message["changes"])
+        if message["cards"]:
+            board = list(state["board"])
+            for index, card in message["cards"]:
+                board[index] = card
+            state["board"] = board
+        self._on_game_state_update(state)
+
+    def _on_room_created(self, message):
+        room_id = message.get("room_id")
+        room_name = message.get("name")
+        owner_fileno = message.get("owner_fileno")
+        print(f"[CLIENT] Room '{room_name}' (ID: {room_id}) created!")
+        self.current_room_id = room_id
+        self.current_room_owner_fileno = owner_fileno
+        self.game_active = False # Not active until game starts
+        self.my_chosen_team = None # Reset chosen team when entering a new room
+        self._last_game_state = None
+        self._lobby_bg_dirty = True
+
+    def _on_room_joined(self, message):
+        room_id = message.get("room_id")
+        owner_fileno = message.get("owner_fileno")
+        print(f"[CLIENT] Joined room: {room_id}")
+        self.current_room_id = room_id
+        self.current_room_owner_fileno = owner_fileno
+        self.game_active = False
+        self.my_chosen_team = None # Reset chosen team when entering a new room
+        self._last_game_state = None
+        self._lobby_bg_dirty = True
 
-        elif mtype == "team_set_ack":
-            self.my_chosen_team = message.get("team")
-            print(f"[CLIENT] Team choice acknowledged: {self.my_chosen_team}")
+    def _on_room_left(self, message):
+        print("[CLIENT] Left room.")
+        self.current_room_id = None
+        self.current_room_owner_fileno = None
+        self.game_active = False # Game is no longer active for this client
+        self.my_chosen_team = None # Reset chosen team when leaving room
+        self.my_assigned_team = None
+        self.my_assigned_role = None
+        self._last_game_state = None
+        self._lobby_bg_dirty = True
 
-        elif mtype == "game_start_ack":
-            print(f"[CLIENT] Game start acknowledged: {message.get('message', 'Game started!')}")
+    def _on_team_set_ack(self, message):
+        self.my_chosen_team = message.get("team")
+        print(f"[CLIENT] Team choice acknowledged: {self.my_chosen_team}")
 
-        elif mtype == "error":
-            print(f"[CLIENT] Server Error: {message.get('message', 'An unknown error occurred.')}")
+    def _on_game_start_ack(self, message):
+        print(f"[CLIENT] Game start acknowledged: {message.get('message', 'Game started!')}")
 
-        else:
-            print(f"[CLIENT] Unknown message type: {mtype}")
+    def _on_error(self, message):
+        print(f"[CLIENT] Server Error: {message.get('message', 'An unknown error occurred.')}")
 
     def _send_chat_message(self):
         """Sends a chat message to the server."""
@@ -400,10 +597,6 @@ class CodenamesClient:
                 print("[CLIENT] Invalid clue. Word and number (1-9) are required.")
                 return
 
-
-            # self._send_guess(clue_word)
-
-
             message = {"type": "clue", "word": clue_word, "number": clue_number}
             self._send_message(message)
             self.clue_word_input.clear_text()
@@ -430,115 +623,160 @@ class CodenamesClient:
 
     def _reset_connection_state(self):
         """Resets client state upon disconnection."""
-        self.connected = False
-        self.logged_in = False
-        self.game_active = False
-        self.current_room_id = None
-        self.current_room_owner_fileno = None
-        self.game_start_requested = False
-        self.lobby_players = []
-        self.lobby_rooms = []
-        self.lobby_chat = []
-        # Clear game state as well
-        self.game_board = []
-        self.red_score = 0
-        self.blue_score = 0
-        self.current_turn = None
-        self.clue_word = ""
-        self.clue_number = 0
-        self.guesses_made = 0
-        self.game_over = False
-        self.winner = None
-        self.is_spymaster = False
-        self.spymaster_red_fileno = None
-        self.spymaster_blue_fileno = None
-        self.operative_red_filenos = []
-        self.operative_blue_filenos = []
-        self.my_assigned_team = None
-        self.my_assigned_role = None
-        self.my_chosen_team = None
+        with self._state_lock: # Main and listener threads can both hit a disconnect
+            if self.client is None:
+                return # Already reset
+            self.connected = False
+            self.logged_in = False
+            self.game_active = False
+            self.current_room_id = None
+            self.current_room_owner_fileno = None
+            self.game_start_requested = False
+            self.lobby_players = []
+            self.lobby_rooms = []
+            self._rooms_by_id = {}
+            self.lobby_chat = []
+            self.lobby_chat_last = ""
+            self._rx_pending = bytearray() # Rebound, not cleared, the listener may still hold a view of the old one
+            # Clear game state as well
+            self.game_board = []
+            self._card_word_surfaces = None
+            self._cached_board_words = ()
+            self._last_game_state = None
+            self.red_score = 0
+            self.blue_score = 0
+            self.current_turn = None
+            self.clue_word = ""
+            self.clue_number = 0
+            self.guesses_made = 0
+            self.game_over = False
+            self.winner = None
+            self.is_spymaster = False
+            self.spymaster_red_fileno = None
+            self.spymaster_blue_fileno = None
+            self.operative_red_filenos = []
+            self.operative_blue_filenos = []
+            self.my_assigned_team = None
+            self.my_assigned_role = None
+            self.my_chosen_team = None
+            self._lobby_bg_dirty = True
+            self._dirty = True
+
+            # Drop messages from the old connection that run() hasn't applied yet
+            while True:
+                try:
+                    self._msg_queue.get_nowait()
+                except queue.Empty:
+                    break
 
-        if self.client:
+            try:
+                self._sel.unregister(self.client)
+            except (KeyError, ValueError): # Never registered or already closed
+                pass
             self.client.close()
-        print("[CLIENT] Connection state reset.")
+            self.client = None
+            print("[CLIENT] Connection state reset.")
 
-    def _draw_lobby(self, mouse_pos):
-        """Draws the main lobby screen."""
-        ui_elements = []
-        self.screen.fill(BG_COLOR)
+    def _render_lobby_background(self):
+        """Renders the static part of the lobby (panels, lists, chat) to an offscreen surface."""
+        player_panel_rect = self.player_panel_rect
+        room_panel_rect = self.room_panel_rect
+        chat_panel_rect = self.chat_panel_rect
+        bg = pygame.Surface((WIDTH, HEIGHT)).convert()
+        bg.fill(BG_COLOR)
 
-        self._draw_text("Codenames Lobby", FONT_LARGE, TEXT_COLOR, WIDTH // 2, 30)
-
-        # Refresh button
-        self.refresh_lobby_button.rect.topright = (WIDTH - 20, 30)
-        self.refresh_lobby_button.draw(self.screen, mouse_pos)
-        ui_elements.append(self.refresh_lobby_button)
+        self._draw_text("Codenames Lobby", FONT_LARGE, TEXT_COLOR, WIDTH // 2, 30, surface=bg)
 
         # Players List Panel
-        player_panel_rect = pygame.Rect(20, 70, 250, HEIGHT - 250)
-        pygame.draw.rect(self.screen, PANEL_COLOR, player_panel_rect, border_radius=10)
-        self._draw_text("Online Players:", FONT_MEDIUM, TEXT_COLOR, player_panel_rect.x + 10, player_panel_rect.y + 10, center=False)
+        pygame.draw.rect(bg, PANEL_COLOR, player_panel_rect, border_radius=10)
+        self._draw_text("Online Players:", FONT_MEDIUM, TEXT_COLOR, player_panel_rect.x + 10, player_panel_rect.y + 10, center=False, surface=bg)
         
         y_offset = player_panel_rect.y + 50
         for i, pname in enumerate(self.lobby_players):
-            self._draw_text(pname, FONT_SMALL, HIGHLIGHT_COLOR if pname == self.username else TEXT_COLOR, player_panel_rect.x + 20, y_offset + i * 25, center=False)
+            self._draw_text(pname, FONT_SMALL, HIGHLIGHT_COLOR if pname == self.username else TEXT_COLOR, player_panel_rect.x + 20, y_offset + i * 25, center=False, surface=bg)
 
         # Rooms List Panel
-        room_panel_rect = pygame.Rect(290, 70, WIDTH - 310, HEIGHT - 250)
-        pygame.draw.rect(self.screen, PANEL_COLOR, room_panel_rect, border_radius=10)
-        self._draw_text("Available Rooms:", FONT_MEDIUM, TEXT_COLOR, room_panel_rect.x + 10, room_panel_rect.y + 10, center=False)
-
-        # Create Room Input & Button
-        self.create_room_input.rect.topleft = (room_panel_rect.x + 10, room_panel_rect.y + 50)
-        self.create_room_input.rect.width = 200 # Fixed width
-        self.create_room_input.draw(self.screen)
-        ui_elements.append(self.create_room_input)
-
-        self.create_room_button.rect.topleft = (self.create_room_input.rect.right + 10, room_panel_rect.y + 50)
-        self.create_room_button.draw(self.screen, mouse_pos)
-        ui_elements.append(self.create_room_button)
-
+        pygame.draw.rect(bg, PANEL_COLOR, room_panel_rect, border_radius=10)
+        self._draw_text("Available Rooms:", FONT_MEDIUM, TEXT_COLOR, room_panel_rect.x + 10, room_panel_rect.y + 10, center=False, surface=bg)
 
         # Room List Display
         room_list_start_y = room_panel_rect.y + 100
         for i, room in enumerate(self.lobby_rooms):
             y = room_list_start_y + i * 45
             room_entry_rect = pygame.Rect(room_panel_rect.x + 10, y, room_panel_rect.width - 20, 40)
-            pygame.draw.rect(self.screen, (50, 50, 65), room_entry_rect, border_radius=5)
+            pygame.draw.rect(bg, (50, 50, 65), room_entry_rect, border_radius=5)
             
             status_text = "In Progress" if room.get('game_in_progress', False) else "Waiting"
             room_info_text = f"ID: {room['id']} - {room['name']} (Players: {room['players']}/8) - {status_text}"
-            self._draw_text(room_info_text, FONT_SMALL, TEXT_COLOR, room_entry_rect.x + 10, room_entry_rect.y + 10, center=False)
-            
-            can_join = not room.get('game_in_progress', False) and self.current_room_id is None and room['players'] < 8
-            join_btn = Button(room_entry_rect.right - 80, room_entry_rect.y + 5, 70, 30, "Join", 
-                              lambda r_id=room['id']: self._send_join_room(r_id), font=FONT_SMALL, is_enabled=can_join)
-            join_btn.draw(self.screen, mouse_pos)
-            ui_elements.append(join_btn)
+            self._draw_text(room_info_text, FONT_SMALL, TEXT_COLOR, room_entry_rect.x + 10, room_entry_rect.y + 10, center=False, surface=bg)
 
         # Chat Panel (bottom)
-        chat_panel_rect = pygame.Rect(20, HEIGHT - 170, WIDTH - 40, 150)
-        pygame.draw.rect(self.screen, PANEL_COLOR, chat_panel_rect, border_radius=10)
-        self._draw_text("Lobby Chat", FONT_MEDIUM, TEXT_COLOR, chat_panel_rect.x + 10, chat_panel_rect.y + 15, center=False)
+        pygame.draw.rect(bg, PANEL_COLOR, chat_panel_rect, border_radius=10)
+        self._draw_text("Lobby Chat", FONT_MEDIUM, TEXT_COLOR, chat_panel_rect.x + 10, chat_panel_rect.y + 15, center=False, surface=bg)
 
         # Display last chat message
         chat_msg_area_rect = pygame.Rect(chat_panel_rect.x + 10, chat_panel_rect.y + 50, chat_panel_rect.width - 20, 30)
-        pygame.draw.rect(self.screen, (20, 20, 30), chat_msg_area_rect, border_radius=5)
+        pygame.draw.rect(bg, (20, 20, 30), chat_msg_area_rect, border_radius=5)
         
-        if self.lobby_chat:
-            last_msg = self.lobby_chat[-1]
-            self._draw_text(last_msg, FONT_SMALL, TEXT_COLOR, chat_msg_area_rect.x + 5, chat_msg_area_rect.y + 5, center=False)
+        if self.lobby_chat_last:
+            self._draw_text(self.lobby_chat_last, FONT_SMALL, TEXT_COLOR, chat_msg_area_rect.x + 5, chat_msg_area_rect.y + 5, center=False, surface=bg)
+
+        self._lobby_bg_surface = bg
+        self._lobby_bg_dirty = False
+
+    def _join_button(self, row):
+        """Returns the pooled Join button for a row of the room list, creating it the first time the row is shown."""
+        while len(self.join_buttons) <= row:
+            y = self.room_panel_rect.y + 105 + len(self.join_buttons) * 45
+            self.join_buttons.append(Button(self.room_panel_rect.right - 90, y, 70, 30, "Join", font=FONT_SMALL, is_enabled=False))
+        return self.join_buttons[row]
+
+    def _draw_lobby(self, mouse_pos):
+        """Draws the main lobby screen: the cached static layer plus buttons and input boxes."""
+        ui_elements = []
+
+        full_redraw = self._lobby_bg_dirty or self._lobby_bg_surface is None
+        if full_redraw:
+            self._render_lobby_background()
+        self.screen.blit(self._lobby_bg_surface, (0, 0))
+
+        # Refresh button
+        self.refresh_lobby_button.draw(self.screen, mouse_pos)
+        ui_elements.append(self.refresh_lobby_button)
+
+        # Create Room Input & Button
+        self.create_room_input.draw(self.screen)
+        ui_elements.append(self.create_room_input)
+
+        self.create_room_button.draw(self.screen, mouse_pos)
+        ui_elements.append(self.create_room_button)
+
+
+        # Join buttons for the room list
+        for i, room in enumerate(self.lobby_rooms):
+            join_btn = self._join_button(i)
+            join_btn.is_enabled = not room.get('game_in_progress', False) and self.current_room_id is None and room['players'] < 8
+            join_btn.action = functools.partial(self._send_join_room, room['id'])
+            join_btn.draw(self.screen, mouse_pos)
+            ui_elements.append(join_btn)
 
         # Chat Input & Send Button
-        self.chat_input.rect.topleft = (chat_panel_rect.x + 10, chat_panel_rect.y + 90)
-        self.chat_input.rect.width = chat_panel_rect.width - 120
         self.chat_input.draw(self.screen)
         ui_elements.append(self.chat_input)
         
-        self.send_chat_button.rect.topleft = (self.chat_input.rect.right + 5, chat_panel_rect.y + 90)
         self.send_chat_button.draw(self.screen, mouse_pos)
         ui_elements.append(self.send_chat_button)
 
+        # Only the widgets (and button shadows) can change between background rebuilds
+        if full_redraw:
+            self._dirty_rects = None
+        else:
+            self._dirty_rects = []
+            for element in ui_elements:
+                shadow = getattr(element, 'shadow_offset', 0)
+                rect = element.rect
+                self._dirty_rects.append(pygame.Rect(rect.x, rect.y, rect.width + shadow, rect.height + shadow))
+
         return ui_elements
 
     def _draw_room_lobby(self, mouse_pos):
@@ -546,7 +784,7 @@ class CodenamesClient:
         ui_elements = []
         self.screen.fill(BG_COLOR)
 
-        current_room_info = next((r for r in self.lobby_rooms if r['id'] == self.current_room_id), None)
+        current_room_info = self._rooms_by_id.get(self.current_room_id)
         
         room_name = current_room_info['name'] if current_room_info else "Unknown Room"
         
@@ -554,12 +792,11 @@ class CodenamesClient:
         self._draw_text("Waiting for game to start...", FONT_MEDIUM, HIGHLIGHT_COLOR, WIDTH // 2, 100)
 
         # Refresh button in room lobby
-        self.refresh_lobby_button.rect.topright = (WIDTH - 20, 30)
         self.refresh_lobby_button.draw(self.screen, mouse_pos)
         ui_elements.append(self.refresh_lobby_button)
 
         # Display players in the room
-        self._draw_text("Players in Room:", FONT_MEDIUM, TEXT_COLOR, WIDTH // 2, 150, center=True)
+        self._draw_prompt("Players in Room:", WIDTH // 2, 150)
         
         y_offset = 180
         if current_room_info:
@@ -572,7 +809,7 @@ class CodenamesClient:
             y_offset += 50 # Extra space for team choice
 
         # Team Selection
-        self._draw_text("Choose your team:", FONT_MEDIUM, TEXT_COLOR, WIDTH // 2, y_offset, center=True)
+        self._draw_prompt("Choose your team:", WIDTH // 2, y_offset)
         y_offset += 40
 
         self.red_team_button.rect.topleft = (WIDTH // 2 - 120, y_offset)
@@ -595,7 +832,7 @@ class CodenamesClient:
             chosen_team_color = RED_CARD if self.my_chosen_team == "red" else BLUE_CARD
             self._draw_text(f"Your choice: {self.my_chosen_team.upper()}", FONT_MEDIUM, chosen_team_color, WIDTH // 2, y_offset, center=True)
         else:
-            self._draw_text("No team chosen yet.", FONT_MEDIUM, TEXT_COLOR, WIDTH // 2, y_offset, center=True)
+            self._draw_prompt("No team chosen yet.", WIDTH // 2, y_offset)
 
         y_offset += 30 # Space for start/leave buttons
 
@@ -603,7 +840,9 @@ class CodenamesClient:
         is_owner = True
         players_in_room_count = current_room_info['players'] if current_room_info else 0
         
-        start_game_btn = Button(WIDTH // 2 - 100, y_offset, 200, 50, "Start Game", self._send_start_game_request, is_enabled=is_owner)
+        start_game_btn = self.start_game_btn
+        start_game_btn.rect.y = y_offset
+        start_game_btn.set_enabled(is_owner)
         start_game_btn.draw(self.screen, mouse_pos)
 
         
@@ -617,105 +856,101 @@ class CodenamesClient:
 
 
         # Leave Room Button
-        leave_room_btn = Button(WIDTH // 2 - 100, y_offset + 110, 200, 50, "Leave Room", self._send_leave_room)
+        leave_room_btn = self.leave_room_btn
+        leave_room_btn.rect.y = y_offset + 110
         leave_room_btn.draw(self.screen, mouse_pos)
         ui_elements.append(leave_room_btn)
 
         return ui_elements
 
 
+    def _render_game_background(self):
+        """Renders the parts of the game screen that don't change during a game to an offscreen surface."""
+        bg = pygame.Surface((WIDTH, HEIGHT)).convert()
+        bg.fill(BG_COLOR)
+
+        info_bar_rect = self.info_bar_rect
+        pygame.draw.rect(bg, PANEL_COLOR, info_bar_rect, border_radius=10)
+        self._draw_text(f"Room: {self.current_room_id}", FONT_MEDIUM, TEXT_COLOR, info_bar_rect.x + 20, info_bar_rect.y + 15, center=False, surface=bg)
+        self._draw_text(f"Your username: {self.username}", FONT_MEDIUM, TEXT_COLOR, info_bar_rect.x + 20, info_bar_rect.y + 40, center=False, surface=bg)
+
+        pygame.draw.rect(bg, PANEL_COLOR, self.action_bar_rect, border_radius=10)
+
+        self._game_bg_surface = bg
+        self._game_bg_key = (self.current_room_id, self.username)
+
     def _draw_game(self, mouse_pos):
         """Draws the active game board and controls."""
         ui_elements = []
-        self.screen.fill(BG_COLOR)
+        # Game state read once per frame, reused by the labels, controls and prompts below
+        game_over, clue_word, clue_number, guesses_made = self.game_over, self.clue_word, self.clue_number, self.guesses_made
+        current_turn, my_team, my_role = self.current_turn, self.my_assigned_team, self.my_assigned_role
+        if self._game_bg_key != (self.current_room_id, self.username):
+            self._render_game_background()
+        self.screen.blit(self._game_bg_surface, (0, 0))
 
-        # Use assigned team and role from server
-        my_team = self.my_assigned_team.capitalize() if self.my_assigned_team else "Neutral"
-        my_role = self.my_assigned_role.capitalize() if self.my_assigned_role else "Spectator"
         
         # Game Info Bar (Top)
-        info_bar_height = 100
-        info_bar_rect = pygame.Rect(20, 20, WIDTH - 40, info_bar_height)
-        pygame.draw.rect(self.screen, PANEL_COLOR, info_bar_rect, border_radius=10)
+        info_bar_rect = self.info_bar_rect
         
-        self._draw_text(f"Room: {self.current_room_id}", FONT_MEDIUM, TEXT_COLOR, info_bar_rect.x + 20, info_bar_rect.y + 15, center=False)
-        self._draw_text(f"RED: {self.red_score}", FONT_MEDIUM, RED_CARD, info_bar_rect.x + 250, info_bar_rect.y + 15, center=True)
-        self._draw_text(f"BLUE: {self.blue_score}", FONT_MEDIUM, BLUE_CARD, info_bar_rect.x + 450, info_bar_rect.y + 15, center=True)
+        self._draw_label("red_score", f"RED: {self.red_score}", FONT_MEDIUM, RED_CARD, info_bar_rect.x + 250, info_bar_rect.y + 15, center=True)
+        self._draw_label("blue_score", f"BLUE: {self.blue_score}", FONT_MEDIUM, BLUE_CARD, info_bar_rect.x + 450, info_bar_rect.y + 15, center=True)
         
-        turn_text_color = RED_CARD if self.current_turn == "red" else BLUE_CARD
-        self._draw_text(f"Turn: {self.current_turn.upper()}", FONT_LARGE, turn_text_color, info_bar_rect.x + 650, info_bar_rect.y + 15, center=False)
-
+        turn_text_color = RED_CARD if current_turn == "red" else BLUE_CARD
+        self._draw_label("turn", f"Turn: {current_turn.upper()}", FONT_LARGE, turn_text_color, info_bar_rect.x + 650, info_bar_rect.y + 15, center=False)
 
-        # Display player's team and role
-        player_role_text = f"Your username: {self.username}"
-        player_role_color = RED_CARD if my_team.lower() == "red" else (BLUE_CARD if my_team.lower() == "blue" else TEXT_COLOR)
-        self._draw_text(player_role_text, FONT_MEDIUM, TEXT_COLOR, info_bar_rect.x + 20, info_bar_rect.y + 40, center=False)
 
-        # Display player's team and role
-        player_role_text = f"You role: {my_team} {my_role}"
-        player_role_color = RED_CARD if my_team.lower() == "red" else (BLUE_CARD if my_team.lower() == "blue" else TEXT_COLOR)
-        self._draw_text(player_role_text, FONT_MEDIUM, player_role_color, info_bar_rect.x + 20, info_bar_rect.y + 65, center=False)
+        # Display player's team and role (label and color are derived when the server assigns them)
+        self._draw_label("role", self._role_label, FONT_MEDIUM, self._role_color, info_bar_rect.x + 20, info_bar_rect.y + 65, center=False)
 
 
 
         clue_display_y_in_bar = info_bar_rect.y + 55
         # Adjust clue display position if player role text is present
-        if my_team != "Neutral": # If player has a team/role, shift clue display
+        if self._my_team_label != "Neutral": # If player has a team/role, shift clue display
              clue_display_y_in_bar = info_bar_rect.y + 55
              # Adjust x-position to avoid overlap, or use a different layout
              # For now, let's keep it centered but be aware of potential overlap on smaller screens
         
-        if self.clue_word:
-            self._draw_text(f"Clue: '{self.clue_word}' - Guesses: {self.guesses_made}", 
+        if clue_word:
+            self._draw_label("clue", f"Clue: '{clue_word}' - Guesses: {guesses_made}", 
                       FONT_MEDIUM, TEXT_COLOR, info_bar_rect.centerx, clue_display_y_in_bar, center=True)
         else:
-            self._draw_text("Waiting for Spymaster's clue...", FONT_MEDIUM, TEXT_COLOR, info_bar_rect.centerx, clue_display_y_in_bar, center=True)
+            self._draw_prompt("Waiting for Spymaster's clue...", info_bar_rect.centerx, clue_display_y_in_bar)
 
         # Game Board
-        card_width = 170
-        card_height = 65
-        card_margin = 10
-        start_x = (WIDTH - (5 * card_width + 4 * card_margin)) // 2
-        start_y = info_bar_rect.bottom + 20
-
-        card_rects = []
-        for i, card in enumerate(self.game_board):
-            row = i // 5
-            col = i % 5
-            x = start_x + col * (card_width + card_margin)
-            y = start_y + row * (card_height + card_margin)
-            
-            card_rect = pygame.Rect(x, y, card_width, card_height)
-            card_rects.append((card_rect, card["word"]))
-
-            card_color = (100, 100, 100) # Default unrevealed color
-            text_color = TEXT_COLOR
-
-            if card.get("revealed"):
-                if card.get("color") == "red": card_color = RED_CARD
-                elif card.get("color") == "blue": card_color = BLUE_CARD
-                elif card.get("color") == "innocent": card_color = INNOCENT_CARD
-                elif card.get("color") == "assassin": card_color = ASSASSIN_CARD
-                text_color = REVEALED_TEXT_COLOR
-            elif self.is_spymaster and card.get("color"):
-                if card.get("color") == "red": card_color = RED_CARD
-                elif card.get("color") == "blue": card_color = BLUE_CARD
-                elif card.get("color") == "innocent": card_color = INNOCENT_CARD
-                elif card.get("color") == "assassin": card_color = ASSASSIN_CARD
-            
-            pygame.draw.rect(self.screen, card_color, card_rect, border_radius=8)
-            pygame.draw.rect(self.screen, CARD_BORDER_COLOR, card_rect, 2, border_radius=8)
-            self._draw_text(card["word"], FONT_MEDIUM, text_color, card_rect.centerx, card_rect.centery, center=True)
+        board = self.game_board
+        word_surfaces = self._card_word_surfaces
+        new_board = word_surfaces is None
+        if new_board: # New board since the last frame
+            word_surfaces = []
+            for card_rect, card in zip(self._card_rects, board):
+                hidden_word = render_text(FONT_MEDIUM, card["word"], TEXT_COLOR)
+                revealed_word = render_text(FONT_MEDIUM, card["word"], REVEALED_TEXT_COLOR)
+                # Both colors share one size, so the centered position is computed once per deal
+                word_surfaces.append(((hidden_word, revealed_word), hidden_word.get_rect(center=card_rect.center).topleft))
+            self._card_word_surfaces = word_surfaces
+
+        card_state = []
+        card_blits = [] # Faces and words submitted in one screen.blits call
+        templates = self._card_templates
+        for card_rect, card, (words, word_pos) in zip(self._card_rects, board, word_surfaces):
+            # Revealed cards show their color to everyone, unrevealed ones only to spymasters
+            revealed = bool(card.get("revealed"))
+            face = card.get("color") if revealed or self.is_spymaster else None
+            card_state.append((face, revealed))
+            card_blits.append((templates.get(face, templates[None]), card_rect))
+            card_blits.append((words[revealed], word_pos))
+        self.screen.blits(card_blits, doreturn=False)
         
         # Action Panel at the bottom
-        action_bar_rect = pygame.Rect(20, HEIGHT - 110, WIDTH - 40, 80)
-        pygame.draw.rect(self.screen, PANEL_COLOR, action_bar_rect, border_radius=10)
+        action_bar_rect = self.action_bar_rect
 
         # Determine current player's role and turn status
-        is_current_spymaster_for_turn = (self.my_assigned_role == "spymaster" and self.my_assigned_team == self.current_turn)
-        is_current_operative_for_turn = (self.my_assigned_role == "operative" and self.my_assigned_team == self.current_turn)
+        is_current_spymaster_for_turn = (my_role == "spymaster" and my_team == current_turn)
+        is_current_operative_for_turn = (my_role == "operative" and my_team == current_turn)
         
-        is_current_operative_for_turn_forBTNState = (self.my_assigned_team == self.current_turn)
+        is_current_operative_for_turn_forBTNState = (my_team == current_turn)
 
         # print(f"[CLIENT_DEBUG] In draw_game: Client Fileno={self.client_fileno}, Current Turn={self.current_turn}")
         # print(f"[CLIENT_DEBUG] My Assigned Team={self.my_assigned_team}, My Assigned Role={self.my_assigned_role}")
@@ -727,11 +962,12 @@ class CodenamesClient:
         # print(f"self.blue_score={self.blue_score}, self.red_score={self.red_score}")
 
         # Enable/Disable controls based on role and turn
-        can_give_clue = is_current_spymaster_for_turn and not self.clue_word and not self.game_over
-        can_guess_or_end_turn = is_current_operative_for_turn and self.clue_word and not self.game_over
+        can_give_clue = is_current_spymaster_for_turn and not clue_word and not game_over
+        can_guess_or_end_turn = is_current_operative_for_turn and clue_word and not game_over
 
         self.clue_word_input.set_enabled(can_give_clue)
         self.send_clue_button.set_enabled(can_give_clue)
+        self._can_guess = bool(can_guess_or_end_turn) # Card clicks are handled in run, see _handle_card_click
         self.end_turn_button.set_enabled(True)
 
         # Draw clue input elements
@@ -749,61 +985,109 @@ class CodenamesClient:
         ui_elements.append(self.end_turn_button)
 
         # Display instructions/status for current player
-        if self.game_over:
+        if game_over:
             winner_color = RED_CARD if self.winner == "red" else BLUE_CARD
             winner_text = f"{self.winner.upper()} TEAM WINS!" if self.winner else "GAME OVER!"
             self._draw_text(winner_text, GAME_OVER_FONT, winner_color, WIDTH // 2, HEIGHT // 2 - 100, center=True)
             
-            back_to_lobby_button = Button(WIDTH // 2 - 100, HEIGHT // 2 - 30, 200, 50, "Back to Lobby", self._send_leave_room, font=FONT_MEDIUM)
-            back_to_lobby_button.draw(self.screen, mouse_pos)
-            ui_elements.append(back_to_lobby_button)
-        elif is_current_spymaster_for_turn and not self.clue_word:
-            self._draw_text("It's your turn to give a clue!", FONT_MEDIUM, HIGHLIGHT_COLOR, action_bar_rect.centerx, action_bar_rect.y + 30, center=True)
-            self.end_turn_button.text  = "End Turn"
+            self.back_to_lobby_btn.draw(self.screen, mouse_pos)
+            ui_elements.append(self.back_to_lobby_btn)
+        elif is_current_spymaster_for_turn and not clue_word:
+            self._draw_prompt("It's your turn to give a clue!", action_bar_rect.centerx, action_bar_rect.y + 30)
+            self.end_turn_button.set_text("End Turn")
 
 
 
-        elif is_current_operative_for_turn and self.clue_word:
-            self._draw_text(f"Click a word to guess (Guesses left: {self.clue_number + 1 - self.guesses_made})", 
+        elif is_current_operative_for_turn and clue_word:
+            self._draw_text(f"Click a word to guess (Guesses left: {clue_number + 1 - guesses_made})", 
                            FONT_MEDIUM, HIGHLIGHT_COLOR, action_bar_rect.centerx, action_bar_rect.y + 50, center=True)
-            # Add click handling for game board cards for operatives if it's their turn
-            for rect, word in card_rects:
-                if rect.collidepoint(mouse_pos) and pygame.mouse.get_pressed()[0] and \
-                   not next((c for c in self.game_board if c["word"] == word), {}).get('revealed', False):
-                    # self._send_guess(word)
-                    break
         else:
-            self._draw_text("Waiting for opponent's turn...", FONT_MEDIUM, TEXT_COLOR, action_bar_rect.centerx, action_bar_rect.y + 30, center=True)
+            self._draw_prompt("Waiting for opponent's turn...", action_bar_rect.centerx, action_bar_rect.y + 30)
 
             if(is_current_operative_for_turn_forBTNState):
-                self.end_turn_button.text  = "End Turn"
+                self.end_turn_button.set_text("End Turn")
             else:
-                self.end_turn_button.text  = "Leave the Room"
+                self.end_turn_button.set_text("Leave the Room")
+
+        # Outside the game-over overlay, only the two bars and cards whose face changed need updating
+        prev_card_state = self._prev_card_state
+        if game_over or new_board or prev_card_state is None or len(prev_card_state) != len(card_state):
+            self._dirty_rects = None
+        else:
+            self._dirty_rects = [info_bar_rect, action_bar_rect]
+            self._dirty_rects.extend(rect for rect, state, prev in zip(self._card_rects, card_state, prev_card_state) if state != prev)
+        self._prev_card_state = None if game_over else card_state # Repaint fully once the overlay goes away
 
         return ui_elements
 
+    def _handle_card_click(self, pos):
+        """Sends a guess for the unrevealed card under a click on the game board."""
+        for rect, card in zip(self._card_rects, self.game_board):
+            if rect.collidepoint(pos):
+                if not card["revealed"]:
+                    self._send_guess(card["word"])
+                return
+
     def run(self):
         """Main client application loop."""
         ui_elements = []
 
         while self.running:
+            # Apply everything the listener thread received since the last frame
+            while True:
+                try:
+                    message = self._msg_queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._handle_message(message)
+
             mouse_pos = pygame.mouse.get_pos()
             
             for event in pygame.event.get():
+                self._dirty = True # Clicks and typing can change what's on screen
                 if event.type == pygame.QUIT:
                     self.running = False
+                elif event.type in (pygame.KEYDOWN, pygame.VIDEOEXPOSE):
+                    self._lobby_bg_dirty = True # Typed text may spill past its box, repaint everything
+                    if event.type == pygame.VIDEOEXPOSE:
+                        self._prev_card_state = None # The window was uncovered, the game screen must be flipped whole too
                 
-                for element in ui_elements:
+                # Only clicks and key presses do anything in the UI: route clicks to the elements
+                # under the cursor (plus active inputs, so they can lose focus) and keys to active inputs
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    targets = [e for e in ui_elements if e.rect.collidepoint(event.pos) or (isinstance(e, InputBox) and e.active)]
+                    if self._can_guess and event.button == 1: # One guess per click, not per frame the button is held
+                        self._handle_card_click(event.pos)
+                elif event.type == pygame.KEYDOWN:
+                    targets = [e for e in ui_elements if isinstance(e, InputBox) and e.active]
+                else:
+                    continue
+
+                for element in targets:
                     element.handle_event(event)
 
-            self.screen.fill(BG_COLOR)
+            # Nothing happened and the mouse hasn't moved: the last frame is still correct
+            if not self._dirty and mouse_pos == self._last_mouse:
+                self.clock.tick(FPS)
+                continue
+            self._dirty = False
+            self._last_mouse = mouse_pos
+
+            self._dirty_rects = None
+            if not (self.logged_in and self.current_room_id is None):
+                self._lobby_bg_dirty = True # Other screens paint over the whole window
+            if not (self.logged_in and self.current_room_id is not None and self.game_active):
+                self._prev_card_state = None # Likewise, the game screen repaints fully when it comes back
+                self._can_guess = False
 
             if not self.connected:
+                self.screen.fill(BG_COLOR)
                 self._draw_text("Connect to Server", FONT_LARGE, TEXT_COLOR, WIDTH // 2, HEIGHT // 2 - 80, center=True)
                 self.name_input.draw(self.screen)
                 self.connect_button.draw(self.screen, mouse_pos)
                 ui_elements = [self.name_input, self.connect_button]
             elif not self.logged_in:
+                self.screen.fill(BG_COLOR)
                 self._draw_text("Logging in...", FONT_LARGE, TEXT_COLOR, WIDTH // 2, HEIGHT // 2, center=True)
                 ui_elements = []
             else:
@@ -814,7 +1098,10 @@ class CodenamesClient:
                 else:
                     ui_elements = self._draw_room_lobby(mouse_pos)
 
-            pygame.display.flip()
+            if self._dirty_rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(self._dirty_rects)
             self.clock.tick(FPS)
 
         if self.client:
@@ -15,7 +15,7 @@ from button import Button
 # --- Constants ---
 WIDTH, HEIGHT = 1000, 650
 FPS = 60
-HEADER_LENGTH = 10 # Must match server's HEADER_LENGTH
+HEADER_LENGTH = 4 # Must match server's HEADER_LENGTH
 
 # Colors
 BG_COLOR = (25, 25, 35)
@@ -33,7 +33,8 @@ ASSASSIN_CARD = (30, 30, 30)
 REVEALED_TEXT_COLOR = (255, 255, 255)
 CARD_BORDER_COLOR = (80, 80, 80)
 
-pygame.init()
+pygame.display.init()
+pygame.font.init()
 
 # Fonts
 FontName = 'Comic Sans'
@@ -8,10 +8,12 @@ import sys
 import traceback # For better error debugging
 import select # Import the select module for non-blocking I/O
 
+from textCache import render_text
+
 # --- Constants ---
 WIDTH, HEIGHT = 1000, 650
 FPS = 60
-HEADER_LENGTH = 10 # Must match server's HEADER_LENGTH
+HEADER_LENGTH = 4 # Must match server's HEADER_LENGTH
 
 # Colors
 BG_COLOR = (25, 25, 35)
@@ -29,7 +31,8 @@ ASSASSIN_CARD = (30, 30, 30)
 REVEALED_TEXT_COLOR = (255, 255, 255)
 CARD_BORDER_COLOR = (80, 80, 80)
 
-pygame.init()
+pygame.display.init()
+pygame.font.init()
 
 # Fonts
 FontName = 'Comic Sans'
@@ -59,13 +62,29 @@ class InputBox:
         self.active = False
         self.is_enabled = is_enabled
         self.border_radius = 5
-        self._update_surface()
+        self._dirty = True # Text surface is re-rendered in draw, at most once per frame
+        self._backgrounds = {} # (enabled, active, size) -> pre-rendered box background and border
 
     def _update_surface(self):
         """Renders the current text or placeholder to a surface."""
         current_text_color = self.text_color if self.is_enabled else self.disabled_text_color
         display_text = self.text if self.text else self.placeholder
-        self.txt_surface = self.font.render(display_text, True, current_text_color)
+        self.txt_surface = render_text(self.font, display_text, current_text_color)
+        self._dirty = False
+
+    def _render_background(self, key):
+        """Renders the rounded background and border for one enabled/active state to a surface."""
+        is_enabled, active, size = key
+        background = pygame.Surface(size, pygame.SRCALPHA)
+        box_rect = background.get_rect()
+        current_bg_color = self.color if is_enabled else self.disabled_color
+        pygame.draw.rect(background, current_bg_color, box_rect, border_radius=self.border_radius)
+
+        border_color = self.active_border_color if is_enabled and active else self.inactive_border_color
+        pygame.draw.rect(background, border_color, box_rect, 2, border_radius=self.border_radius)
+        if pygame.display.get_surface() is not None: # convert_alpha needs a display mode
+            background = background.convert_alpha()
+        return background
 
     def handle_event(self, event):
         """Handles Pygame events for the input box."""
@@ -76,22 +95,27 @@ class InputBox:
             self.active = self.rect.collidepoint(event.pos)
         if event.type == pygame.KEYDOWN and self.active:
             if event.key == pygame.K_BACKSPACE:
-                self.text = self.text[:-1]
-            elif event.key != pygame.K_RETURN: # Ignore Enter key press
+                if self.text:
+                    self.text = self.text[:-1]
+                    self._dirty = True
+            elif event.key != pygame.K_RETURN and event.unicode and event.unicode.isprintable():
+                # Ignore Enter, and keys that type nothing (Shift, Ctrl, arrows) or a control character
                 self.text += event.unicode
-            self._update_surface()
+                self._dirty = True
         return False
 
     def draw(self, screen):
         """Draws the input box on the screen."""
-        current_bg_color = self.color if self.is_enabled else self.disabled_color
-        pygame.draw.rect(screen, current_bg_color, self.rect, border_radius=self.border_radius)
-        
-        border_color = self.inactive_border_color
-        if self.is_enabled:
-            border_color = self.active_border_color if self.active else self.inactive_border_color
-        pygame.draw.rect(screen, border_color, self.rect, 2, border_radius=self.border_radius)
-        
+        if self._dirty:
+            self._update_surface()
+
+        key = (self.is_enabled, self.active, self.rect.size)
+        background = self._backgrounds.get(key)
+        if background is None: # First draw in this state, or the box was resized
+            background = self._render_background(key)
+            self._backgrounds[key] = background
+        screen.blit(background, self.rect)
+
         text_x = self.rect.x + 8
         text_y = self.rect.y + (self.rect.height - self.txt_surface.get_height()) // 2
         screen.blit(self.txt_surface, (text_x, text_y))
@@ -103,12 +127,12 @@ class InputBox:
     def clear_text(self):
         """Clears the text in the input box."""
         self.text = ''
-        self._update_surface()
+        self._dirty = True
 
     def set_enabled(self, enabled):
         """Enables or disables the input box."""
         self.is_enabled = enabled
         if not enabled:
             self.active = False
-        self._update_surface() # Update surface to reflect disabled state color
+        self._dirty = True # Update surface to reflect disabled state color
 
@@ -0,0 +1,24 @@
+import pygame
+from collections import OrderedDict
+
+# --- Constants ---
+TEXT_CACHE_SIZE = 512 # Max number of rendered text surfaces kept around
+
+# Rendered text surfaces keyed by (font id, text, color), oldest entries evicted first
+_TEXT_CACHE = OrderedDict()
+
+
+def render_text(font, text, color):
+    """Returns the rendered surface for text, only calling font.render on a cache miss."""
+    key = (id(font), text, color)
+    surface = _TEXT_CACHE.get(key)
+    if surface is None:
+        surface = font.render(text, True, color)
+        if pygame.display.get_surface() is not None: # convert_alpha needs a display mode
+            surface = surface.convert_alpha() # Match the display format so blits skip per-pixel conversion
+        _TEXT_CACHE[key] = surface
+        if len(_TEXT_CACHE) > TEXT_CACHE_SIZE:
+            _TEXT_CACHE.popitem(last=False)
+    else:
+        _TEXT_CACHE.move_to_end(key)
+    return surface
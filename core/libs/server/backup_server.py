@@ -0,0 +1,91 @@
+# Backup server and log setup shared by the core/main.py and core/heartbeat.py entry points
+import socket
+import selectors
+import threading
+import time
+import logging
+import logging.handlers
+import atexit
+import queue
+
+from codenamesServer_class import CodenamesServer
+
+
+def configure_logging():
+    """Server status at INFO, per-guess traces at DEBUG. Records are handed to a listener thread through a queue,
+    so the event loop never blocks on writing them to the console."""
+    log_queue = queue.SimpleQueue()
+    log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[logging.handlers.QueueHandler(log_queue)])
+    log_listener.start()
+    atexit.register(log_listener.stop) # Writes out whatever is still queued
+    return log_listener
+
+class BackupCodenamesServer:
+    PRIMARY_TIMEOUT = 3  # seconds without heartbeat before failover
+    HEARTBEAT_PORT = 5555
+
+    def __init__(self, backup_host='127.0.0.1', backup_port=5555, primary_host='127.0.0.1', primary_port=5555, primary_timeout=PRIMARY_TIMEOUT):
+        self.primary_addr = (primary_host, primary_port)
+        self.backup_addr = (backup_host, backup_port)
+        self.primary_timeout = primary_timeout
+
+        # UDP socket for heartbeat listening
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(self.backup_addr)
+        self._sel = selectors.DefaultSelector() # Wakes on a heartbeat or at the failover deadline
+        self._sel.register(self.sock, selectors.EVENT_READ)
+
+        self.last_heartbeat = time.monotonic()
+        self.running = True
+        self.active = False  # Will be True if promoted to primary
+        self.primary_server_instance = None
+
+    def start(self):
+
+        self.promote_to_primary()
+
+        print(f"Backup server running at {self.backup_addr}, monitoring primary at {self.primary_addr}")
+        try:
+            while self.running:
+                # Sleep until the next heartbeat; only a backup has a deadline to wake up for
+                timeout = None if self.active else max(0.0, self.primary_timeout - (time.monotonic() - self.last_heartbeat))
+                if not self._sel.select(timeout):
+                    if not self.active:
+                        print("Primary heartbeat lost. Promoting self to primary.")
+                        self.promote_to_primary()
+                    continue
+                data, addr = self.sock.recvfrom(1024)
+                msg = data.decode('utf-8')
+                if msg == "PRIMARY_HEARTBEAT":
+                    self.last_heartbeat = time.monotonic()
+                    if self.active:
+                        # Primary recovered or was restarted elsewhere, stop acting as primary
+                        print("Heartbeat received while active as primary. Demoting self back to backup.")
+                        # self.stop_primary_mode()
+        except KeyboardInterrupt:
+            print("Backup server shutting down.")
+            self.running = False
+            self.stop_primary_mode()
+            self._sel.close()
+            self.sock.close()
+
+    def promote_to_primary(self):
+        if self.active:
+            return
+        self.primary_server_instance = CodenamesServer(self.backup_addr[0], 5555)  # Use primary port or backup port?
+        self.active = True
+
+        # Start TCP server threads of promoted primary
+        threading.Thread(target=self.primary_server_instance.start, daemon=True).start()
+
+        # Also start heartbeat sender to other backups (if any)
+        self.primary_server_instance.start_heartbeat_sender(backup_host=self.primary_addr[0], backup_port=self.backup_addr[1])
+        print("Backup server promoted to primary.")
+
+    def stop_primary_mode(self):
+        if self.primary_server_instance:
+            self.primary_server_instance.stop()
+            self.primary_server_instance.stop_heartbeat_sender()
+        self.active = False
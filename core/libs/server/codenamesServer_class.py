@@ -1,10 +1,16 @@
 import socket
 import threading
 import json
+import logging
 import time
 import random
+from collections import deque
+from itertools import islice
 import traceback
 import select
+import selectors
+import struct
+import zlib
 import pymongo
 from datetime import datetime
 
@@ -12,10 +18,42 @@ from mongo_logger import MongoLogger
 from gameRoom import GameRoom
 from player import Player
 
+try:
+    import orjson # Much faster JSON encode/decode, returns bytes directly
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+    JSON_DECODE_ERRORS = (orjson.JSONDecodeError, json.JSONDecodeError)
+else:
+    def _dumps(message):
+        return json.dumps(message).encode('utf-8')
+
+    def _loads(data):
+        return json.loads(str(data, 'utf-8'))
+
+    JSON_DECODE_ERRORS = (json.JSONDecodeError,)
+
+logger = logging.getLogger("codenames.server")
+
 # --- Constants ---
 HOST = '127.0.0.1'
 PORT = 5555
-HEADER_LENGTH = 10
+HEADER_STRUCT = struct.Struct("!I") # Message length as a 4-byte big-endian unsigned int
+HEADER_LENGTH = HEADER_STRUCT.size
+COMPRESSED_FLAG = 0x80000000 # High bit of the length header marks a zlib-compressed body (server to client only)
+MAX_FRAME_SIZE = 64 * 1024 # Largest body accepted from a client; its requests are a few hundred bytes
+COMPRESS_THRESHOLD = 1024 # Bodies larger than this (full game snapshots) are compressed before sending
+CHAT_HISTORY = 50 # Lobby chat messages kept, older ones are dropped
+RECV_BUFFER_SIZE = 65536 # Bytes read per recv while draining a readable client socket
+UPDATE_INTERVAL = 0.1 # Seconds between periodic lobby / game state broadcasts
+MAX_OUTBOX_BYTES = 1 << 20 # A client with this much unsent data is too slow to keep up and is dropped
+SENDMSG_MAX_BUFFERS = 64 # Queued buffers handed to one sendmsg call, well under the usual IOV_MAX of 1024
+HAS_SENDMSG = hasattr(socket.socket, "sendmsg") # Not available on Windows
+HEARTBEAT_MESSAGE = b"PRIMARY_HEARTBEAT" # UDP payload the backup server watches for
+GUEST_NAME_PREFIX = "Guest_" # Default names are this plus the socket's fileno, reserved for that connection
 
 
 # --- Game Logic (Simplified Codenames Board) ---
@@ -27,6 +65,17 @@ ALL_WORDS = [
     "BOARD", "GAME", "PLAY", "RUN", "JUMP", "DANCE", "SING", "ART", "BOOK", "READ"
 ]
 
+def _encode_frame(message):
+    """Serializes a message into a (header, body) frame, compressing large bodies.
+
+    The two parts are kept separate and gathered by sendmsg, so the body is never copied to prepend the header.
+    """
+    data = _dumps(message)
+    if len(data) > COMPRESS_THRESHOLD:
+        data = zlib.compress(data, 1) # Fastest level, JSON still shrinks several times
+        return HEADER_STRUCT.pack(len(data) | COMPRESSED_FLAG), data
+    return HEADER_STRUCT.pack(len(data)), data
+
 class CodenamesServer:
     def __init__(self, host, port):
         self.host = host
@@ -34,29 +83,59 @@ class CodenamesServer:
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.sock.bind((self.host, self.port))
-        self.sock.listen(5)
-        print(f"Server listening on {self.host}:{self.port}")
+        self.sock.listen(socket.SOMAXCONN) # Bursts of connects queue in the kernel until the loop drains them
+        self.sock.setblocking(False)
+        logger.info("Server listening on %s:%s", self.host, self.port)
+        # One selector (epoll on Linux, the best available elsewhere) watches the listening socket and every client,
+        # so each wakeup only touches the sockets that are actually ready
+        self._sel = selectors.DefaultSelector()
+        self._sel.register(self.sock, selectors.EVENT_READ, data=None)
+        self._recv_buf = bytearray(RECV_BUFFER_SIZE) # Reused by every read, all reads happen on the event loop thread
         self.clients = {}
         self.connected_clients = {}
+        self._names = set() # Names of all connected players, kept in sync for O(1) uniqueness checks
         self.rooms = {}
-        self.lobby_chat = []
+        self.lobby_chat = deque(maxlen=CHAT_HISTORY) # Oldest messages evicted on append
+        self._lobby_dirty = True # Set by lobby changes not yet sent out, checked by the periodic update
+        self._rooms_to_flush = set() # Rooms whose game changed this event-loop round, sent once at its end
         self.running = True
-        self.lock = threading.RLock()
+        self._shutdown = threading.Event() # Set by stop(), start() blocks on it instead of polling
+        # Server state is only touched by the event loop thread, which holds this lock for a whole
+        # dispatch round; stop() takes it so shutdown never races a round. Handlers never re-acquire it
+        self.lock = threading.Lock()
         self.mongo_logger = MongoLogger()
 
+        # Message type -> handler, used by _process_message
+        self._handlers = {
+            "join": self._on_join,
+            "chat": self._on_chat,
+            "create_room": self._on_create_room,
+            "join_room": self._on_join_room,
+            "leave_room": self._on_leave_room,
+            "set_team": self._on_set_team,
+            "start_game_request": self._on_start_game_request,
+            "clue": self._on_clue,
+            "guess": self._on_guess,
+            "end_turn": self._on_end_turn,
+            "refresh_lobby": self._on_refresh_lobby,
+        }
+
         
     def start_heartbeat_sender(self, backup_host='127.0.0.1', backup_port=5556, interval=1):
         """Send UDP heartbeat packets periodically to the backup server."""
         self.heartbeat_running = True
         self.backup_addr = (backup_host, backup_port)
         self.udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp_sock.connect(self.backup_addr) # Fixed peer: the route is resolved once, not on every send
         
         def heartbeat_loop():
             while self.heartbeat_running:
                 try:
-                    self.udp_sock.sendto(b"PRIMARY_HEARTBEAT", self.backup_addr)
+                    self.udp_sock.send(HEARTBEAT_MESSAGE)
+                except ConnectionRefusedError:
+                    pass # Connected UDP reports a backup that is not listening (yet); keep sending
                 except Exception as e:
-                    print(f"Heartbeat send error: {e}")
+                    logger.warning("Heartbeat send error: %s", e)
                 time.sleep(interval)
         
         threading.Thread(target=heartbeat_loop, daemon=True).start()
@@ -67,345 +146,503 @@ class CodenamesServer:
             self.udp_sock.close()
 
     def start(self):
-        threading.Thread(target=self._accept_connections, daemon=True).start()
-        threading.Thread(target=self._update_clients_periodically, daemon=True).start()
+        threading.Thread(target=self._event_loop, daemon=True).start()
         try:
-            while self.running:
-                time.sleep(1)
+            self._shutdown.wait()
         except KeyboardInterrupt:
-            print("Server shutting down...")
+            logger.info("Server shutting down...")
         finally:
-            self.stop()
+            if self.running: # Not already stopped by an outside stop() call
+                self.stop()
 
     def stop(self):
         self.running = False
+        self._shutdown.set()
         with self.lock:
             for client_fileno in list(self.clients.keys()):
                 try:
                     self.clients[client_fileno]["socket"].shutdown(socket.SHUT_RDWR)
                     self.clients[client_fileno]["socket"].close()
                 except Exception as e:
-                    print(f"Error closing client socket {client_fileno}: {e}")
+                    logger.warning("Error closing client socket %s: %s", client_fileno, e)
             self.clients.clear()
             self.connected_clients.clear()
+            self._names.clear()
             self.rooms.clear()
+        self._sel.close()
         self.sock.close()
-        print("Server stopped.")
+        self.mongo_logger.close() # Flush events still waiting for the database
+        logger.info("Server stopped.")
+
+    def _event_loop(self):
+        """Single server thread: accepts connections, reads from ready clients and runs the periodic updates."""
+        next_update = time.monotonic()
+        while self.running:
+            try:
+                # Sleep until a socket is ready or the next periodic update is due
+                events = self._sel.select(timeout=max(0.0, next_update - time.monotonic()))
+            except (OSError, ValueError): # Selector closed by stop()
+                break
+            with self.lock:
+                if not self.running:
+                    break
+                for key, mask in events:
+                    if key.data is None:
+                        self._accept_connections()
+                        continue
+                    if mask & selectors.EVENT_WRITE:
+                        self._flush_outbox(key.data)
+                    if mask & selectors.EVENT_READ:
+                        self._read_from_client(key.data)
+                if self._rooms_to_flush:
+                    self._flush_game_states()
+
+                now = time.monotonic()
+                if now >= next_update:
+                    self._update_clients()
+                    next_update = now + UPDATE_INTERVAL
 
     def _accept_connections(self):
+        """Accepts every pending connection on the (non-blocking) listening socket."""
         while self.running:
             try:
                 conn, addr = self.sock.accept()
-                conn.setblocking(False)
-                client_fileno = conn.fileno()
-                print(f"Accepted connection from {addr} (fileno: {client_fileno})")
-                with self.lock:
-                    self.connected_clients[client_fileno] = Player(client_fileno, f"Guest_{client_fileno}")
-                    self.clients[client_fileno] = {"socket": conn, "player_obj": self.connected_clients[client_fileno]}
-                self.mongo_logger.log_event("client_connected", {"fileno": client_fileno, "ip_address": addr[0], "port": addr[1]})
-                threading.Thread(target=self._handle_client, args=(client_fileno,), daemon=True).start()
-            except socket.timeout:
-                pass
+            except BlockingIOError:
+                return
             except Exception as e:
                 if self.running:
-                    print(f"Error accepting connection: {e}")
-                break
+                    logger.error("Error accepting connection: %s", e)
+                return
+            conn.setblocking(False)
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) # Small framed messages, each already sent in one call
+            client_fileno = conn.fileno()
+            logger.info("Accepted connection from %s (fileno: %s)", addr, client_fileno)
+            guest_name = f"{GUEST_NAME_PREFIX}{client_fileno}"
+            self.connected_clients[client_fileno] = Player(client_fileno, guest_name)
+            self._names.add(guest_name)
+            self._lobby_dirty = True
+            self.clients[client_fileno] = {"socket": conn, "player_obj": self.connected_clients[client_fileno], "rxbuf": bytearray(),
+                                     "outbox": deque(), "outbox_bytes": 0, "outbox_offset": 0}
+            self._sel.register(conn, selectors.EVENT_READ, data=client_fileno)
+            self.mongo_logger.log_event("client_connected", {"fileno": client_fileno, "ip_address": addr[0], "port": addr[1]})
 
-    def _handle_client(self, client_fileno):
-        with self.lock:
-            client_info = self.clients.get(client_fileno)
-            if not client_info: return
-            client_sock = client_info["socket"]
+    def _read_from_client(self, client_fileno):
+        """Drains a readable client socket into its buffer and processes every complete message."""
+        client_info = self.clients.get(client_fileno)
+        if not client_info: return
+        client_sock = client_info["socket"]
+        rxbuf = client_info["rxbuf"]
         try:
-            while self.running:
-                readable, _, _ = select.select([client_sock], [], [], 0.1)
-                if client_sock in readable:
-                    header = client_sock.recv(HEADER_LENGTH)
-                    if not header:
-                        print(f"Client {client_fileno} disconnected.")
-                        break
-                    msg_len = int(header.decode('utf-8').strip())
-                    full_message_bytes = b''
-                    while len(full_message_bytes) < msg_len:
-                        chunk = client_sock.recv(msg_len - len(full_message_bytes))
-                        if not chunk:
-                            print(f"Client {client_fileno} disconnected during message body read.")
-                            break
-                        full_message_bytes += chunk
-                    if len(full_message_bytes) < msg_len:
+            recv_buf = self._recv_buf
+            while True:
+                try:
+                    nbytes = client_sock.recv_into(recv_buf)
+                except BlockingIOError:
+                    break
+                if not nbytes:
+                    logger.info("Client %s disconnected.", client_fileno)
+                    self._cleanup_client(client_fileno)
+                    return
+                with memoryview(recv_buf) as view, view[:nbytes] as chunk:
+                    rxbuf += chunk
+                if nbytes < RECV_BUFFER_SIZE: # Short read, the socket is drained
+                    break
+                if len(rxbuf) > MAX_FRAME_SIZE + HEADER_LENGTH: # Parse before buffering more; the rest is read next round
+                    break
+
+            # A single read can carry several messages, or only part of one. Frames are decoded
+            # through memoryviews and the consumed bytes are dropped once, after the loop
+            offset = 0
+            try:
+                while len(rxbuf) - offset >= HEADER_LENGTH:
+                    (header,) = HEADER_STRUCT.unpack_from(rxbuf, offset)
+                    if header > MAX_FRAME_SIZE: # Also rejects COMPRESSED_FLAG, clients never compress
+                        logger.warning("Oversized or compressed frame (header %#x) from client %s.", header, client_fileno)
+                        self._cleanup_client(client_fileno)
+                        return
+                    body_start = offset + HEADER_LENGTH
+                    frame_end = body_start + header
+                    if len(rxbuf) < frame_end:
                         break
-                    message = json.loads(full_message_bytes.decode('utf-8'))
+                    with memoryview(rxbuf) as view, view[body_start:frame_end] as body:
+                        message = _loads(body)
+                    offset = frame_end
                     self._process_message(client_fileno, message)
+            finally:
+                del rxbuf[:offset]
         except ConnectionResetError:
-            print(f"Client {client_fileno} connection reset by peer.")
-        except ValueError:
-            print(f"Invalid message header from client {client_fileno}.")
-        except json.JSONDecodeError:
-            print(f"Invalid JSON message from client {client_fileno}.")
+            logger.info("Client %s connection reset by peer.", client_fileno)
+            self._cleanup_client(client_fileno)
+        except JSON_DECODE_ERRORS:
+            logger.warning("Invalid JSON message from client %s.", client_fileno)
+            self._cleanup_client(client_fileno)
         except Exception as e:
             if self.running:
-                print(f"Error in _handle_client for {client_fileno}: {e}\n{traceback.format_exc()}")
-        finally:
+                logger.exception("Error reading from client %s: %s", client_fileno, e)
             self._cleanup_client(client_fileno)
 
     def _process_message(self, client_fileno, message):
+        """Dispatches a decoded client message to its _on_<type> handler."""
+        player_obj = self.connected_clients.get(client_fileno)
+        if not player_obj: return
         mtype = message.get("type")
-        with self.lock:
-            player_obj = self.connected_clients.get(client_fileno)
-            if not player_obj: return
-            client_name = player_obj.name
-            current_room_id = player_obj.room_id
+        handler = self._handlers.get(mtype)
+        if handler:
+            handler(client_fileno, player_obj, message)
+        else:
+            logger.warning("Unknown message type from %s (%s): %s", player_obj.name, client_fileno, mtype)
 
-            if mtype == "join":
-                new_name = message.get("name", f"Guest_{client_fileno}")
-                if any(p.name == new_name for f, p in self.connected_clients.items() if f != client_fileno):
-                    self._send_to_client(client_fileno, {"type": "error", "message": f"Username '{new_name}' is already taken. Please choose another."})
-                    return
-                player_obj.name = new_name
-                self._add_lobby_chat_message(f"{new_name} joined the lobby.", is_system=True)
-                print(f"{client_name} (fileno {client_fileno}) changed name to {new_name}.")
-                self.mongo_logger.log_event("player_named", {"fileno": client_fileno, "new_name": new_name})
-                self._broadcast_lobby_update()
-            elif mtype == "chat":
-                text = message.get("text", "")
-                if text:
-                    if current_room_id:
-                        room = self.rooms.get(current_room_id)
-                        if room:
-                            room.add_chat_message(f"{client_name}: {text}")
-                            self.mongo_logger.log_event("room_chat", {"room_id": current_room_id, "player_name": client_name, "message": text})
-                    else:
-                        self._add_lobby_chat_message(f"{client_name}: {text}")
-                        self.mongo_logger.log_event("lobby_chat", {"player_name": client_name, "message": text})
-            elif mtype == "create_room":
-                room_name = message.get("name", f"Room_{random.randint(1000, 9999)}")
-                new_room_id = f"room_{len(self.rooms) + 1}"
-                if current_room_id:
-                    self._send_to_client(client_fileno, {"type": "error", "message": "Please leave current room first."})
-                    return
-                new_room = GameRoom(new_room_id, client_fileno, self, room_name)
-                self.rooms[new_room_id] = new_room
-                new_room.add_client(client_fileno, client_name)
-                self._add_lobby_chat_message(f"{client_name} created room '{room_name}'.", is_system=True)
-                print(f"{client_name} created room {new_room_id}.")
-                self.mongo_logger.log_event("room_created", {"room_id": new_room_id, "room_name": room_name, "owner_fileno": client_fileno, "owner_name": client_name})
-                self._send_to_client(client_fileno, {"type": "room_created", "room_id": new_room_id, "name": room_name, "owner_fileno": client_fileno})
-                self._broadcast_lobby_update()
-            elif mtype == "join_room":
-                target_room_id = message.get("room_id")
-                room = self.rooms.get(target_room_id)
-                if not room:
-                    self._send_to_client(client_fileno, {"type": "error", "message": "Room not found."})
-                    return
-                if room.game_in_progress:
-                    self._send_to_client(client_fileno, {"type": "error", "message": "Cannot join: Game in progress."})
-                    return
-                if current_room_id:
-                    self._send_to_client(client_fileno, {"type": "error", "message": "Please leave current room first."})
-                    return
-                room.add_client(client_fileno, client_name)
-                self._add_lobby_chat_message(f"{client_name} joined room '{target_room_id}'.", is_system=True)
-                print(f"{client_name} joined room {target_room_id}.")
-                self.mongo_logger.log_event("room_joined", {"room_id": target_room_id, "player_fileno": client_fileno, "player_name": client_name})
-                self._send_to_client(client_fileno, {"type": "room_joined", "room_id": target_room_id, "owner_fileno": room.owner_fileno})
-                self._broadcast_lobby_update()
-            elif mtype == "leave_room":
-                if current_room_id:
-                    room = self.rooms.get(current_room_id)
-                    if room:
-                        room.remove_client(client_fileno)
-                        self.mongo_logger.log_event("room_left", {"room_id": current_room_id, "player_fileno": client_fileno, "player_name": client_name})
-                        if not room.clients:
-                            del self.rooms[current_room_id]
-                            print(f"Room {current_room_id} deleted as it is empty.")
-                            self.mongo_logger.log_event("room_deleted", {"room_id": current_room_id})
-                        self._add_lobby_chat_message(f"{client_name} left room '{current_room_id}'.", is_system=True)
-                    print(f"{client_name} left room {current_room_id}.")
-                    self._send_to_client(client_fileno, {"type": "room_left"})
-                    self._broadcast_lobby_update()
+    def _on_join(self, client_fileno, player_obj, message):
+        client_name = player_obj.name
+        guest_name = f"{GUEST_NAME_PREFIX}{client_fileno}"
+        new_name = message.get("name", guest_name)
+        # Guest names are tied to a fileno, so taking another one would collide with the next connection on that fileno
+        if new_name != guest_name and new_name.startswith(GUEST_NAME_PREFIX):
+            self._send_to_client(client_fileno, {"type": "error", "message": f"Names starting with '{GUEST_NAME_PREFIX}' are reserved. Please choose another."})
+            return
+        if new_name != client_name and new_name in self._names:
+            self._send_to_client(client_fileno, {"type": "error", "message": f"Username '{new_name}' is already taken. Please choose another."})
+            return
+        self._names.discard(client_name)
+        self._names.add(new_name)
+        player_obj.name = new_name
+        self._add_lobby_chat_message(f"{new_name} joined the lobby.", is_system=True)
+        logger.info("%s (fileno %s) changed name to %s.", client_name, client_fileno, new_name)
+        self.mongo_logger.log_event("player_named", {"fileno": client_fileno, "new_name": new_name})
+        self._broadcast_lobby_update()
+
+    def _on_chat(self, client_fileno, player_obj, message):
+        client_name = player_obj.name
+        current_room_id = player_obj.room_id
+        text = message.get("text", "")
+        if text:
+            if current_room_id:
+                room = self.rooms.get(current_room_id)
+                if room:
+                    room.add_chat_message(f"{client_name}: {text}")
+                    self.mongo_logger.log_event("room_chat", {"room_id": current_room_id, "player_name": client_name, "message": text})
+            else:
+                self._add_lobby_chat_message(f"{client_name}: {text}")
+                self.mongo_logger.log_event("lobby_chat", {"player_name": client_name, "message": text})
+
+    def _on_create_room(self, client_fileno, player_obj, message):
+        client_name = player_obj.name
+        current_room_id = player_obj.room_id
+        room_name = message.get("name", f"Room_{random.randint(1000, 9999)}")
+        new_room_id = f"room_{len(self.rooms) + 1}"
+        if current_room_id:
+            self._send_to_client(client_fileno, {"type": "error", "message": "Please leave current room first."})
+            return
+        new_room = GameRoom(new_room_id, client_fileno, self, room_name)
+        self.rooms[new_room_id] = new_room
+        new_room.add_client(client_fileno, client_name)
+        self._add_lobby_chat_message(f"{client_name} created room '{room_name}'.", is_system=True)
+        logger.info("%s created room %s.", client_name, new_room_id)
+        self.mongo_logger.log_event("room_created", {"room_id": new_room_id, "room_name": room_name, "owner_fileno": client_fileno, "owner_name": client_name})
+        self._send_to_client(client_fileno, {"type": "room_created", "room_id": new_room_id, "name": room_name, "owner_fileno": client_fileno})
+        self._broadcast_lobby_update()
+
+    def _on_join_room(self, client_fileno, player_obj, message):
+        client_name = player_obj.name
+        current_room_id = player_obj.room_id
+        target_room_id = message.get("room_id")
+        room = self.rooms.get(target_room_id)
+        if not room:
+            self._send_to_client(client_fileno, {"type": "error", "message": "Room not found."})
+            return
+        if room.game_in_progress:
+            self._send_to_client(client_fileno, {"type": "error", "message": "Cannot join: Game in progress."})
+            return
+        if current_room_id:
+            self._send_to_client(client_fileno, {"type": "error", "message": "Please leave current room first."})
+            return
+        room.add_client(client_fileno, client_name)
+        self._add_lobby_chat_message(f"{client_name} joined room '{target_room_id}'.", is_system=True)
+        logger.info("%s joined room %s.", client_name, target_room_id)
+        self.mongo_logger.log_event("room_joined", {"room_id": target_room_id, "player_fileno": client_fileno, "player_name": client_name})
+        self._send_to_client(client_fileno, {"type": "room_joined", "room_id": target_room_id, "owner_fileno": room.owner_fileno})
+        self._broadcast_lobby_update()
+
+    def _on_leave_room(self, client_fileno, player_obj, message):
+        client_name = player_obj.name
+        current_room_id = player_obj.room_id
+        if current_room_id:
+            room = self.rooms.get(current_room_id)
+            if room:
+                room.remove_client(client_fileno)
+                self.mongo_logger.log_event("room_left", {"room_id": current_room_id, "player_fileno": client_fileno, "player_name": client_name})
+                if not room.clients:
+                    del self.rooms[current_room_id]
+                    logger.info("Room %s deleted as it is empty.", current_room_id)
+                    self.mongo_logger.log_event("room_deleted", {"room_id": current_room_id})
+                self._add_lobby_chat_message(f"{client_name} left room '{current_room_id}'.", is_system=True)
+            logger.info("%s left room %s.", client_name, current_room_id)
+            self._send_to_client(client_fileno, {"type": "room_left"})
+            self._broadcast_lobby_update()
+        else:
+            self._send_to_client(client_fileno, {"type": "error", "message": "Not in a room to leave."})
+
+    def _on_set_team(self, client_fileno, player_obj, message):
+        team_choice = message.get("team")
+        if team_choice in ["red", "blue"] and player_obj.room_id:
+            player_obj.chosen_team = team_choice
+            logger.info("Player %s (fileno %s) chose team: %s", player_obj.name, client_fileno, team_choice)
+            self.mongo_logger.log_event("team_chosen", {"player_fileno": client_fileno, "player_name": player_obj.name, "chosen_team": team_choice})
+            self._send_to_client(client_fileno, {"type": "team_set_ack", "team": team_choice})
+            self._broadcast_lobby_update()
+        else:
+            self._send_to_client(client_fileno, {"type": "error", "message": "Invalid team choice or not in a room."})
+
+    def _on_start_game_request(self, client_fileno, player_obj, message):
+        current_room_id = player_obj.room_id
+        if current_room_id:
+            room = self.rooms.get(current_room_id)
+            if room and client_fileno == room.owner_fileno:
+                success, msg = room.start_game()
+                if not success:
+                    self._send_to_client(client_fileno, {
+                        "type": "guess_feedback",
+                        "message": msg,
+                        "guess": None,
+                        "clue": room.clue_word,
+                        "team": player_obj.team,
+                        "turn": room.turn
+                    })
                 else:
-                    self._send_to_client(client_fileno, {"type": "error", "message": "Not in a room to leave."})
-            elif mtype == "set_team":
-                team_choice = message.get("team")
-                if team_choice in ["red", "blue"] and player_obj.room_id:
-                    player_obj.chosen_team = team_choice
-                    print(f"Player {player_obj.name} (fileno {client_fileno}) chose team: {team_choice}")
-                    self.mongo_logger.log_event("team_chosen", {"player_fileno": client_fileno, "player_name": player_obj.name, "chosen_team": team_choice})
-                    self._send_to_client(client_fileno, {"type": "team_set_ack", "team": team_choice})
+                    # self.mongo_logger.log_event("game_started", {"room_id": current_room_id})
+                    self._send_to_client(client_fileno, {"type": "game_start_ack", "message": msg})
                     self._broadcast_lobby_update()
-                else:
-                    self._send_to_client(client_fileno, {"type": "error", "message": "Invalid team choice or not in a room."})
-            elif mtype == "start_game_request":
-                if current_room_id:
-                    room = self.rooms.get(current_room_id)
-                    if room and client_fileno == room.owner_fileno:
-                        success, msg = room.start_game()
-                        if not success:
-                            self._send_to_client(client_fileno, {
-                                "type": "guess_feedback",
-                                "message": msg,
-                                "guess": None,
-                                "clue": room.clue_word,
-                                "team": player_obj.team,
-                                "turn": room.turn
-                            })
-                        else:
-                            # self.mongo_logger.log_event("game_started", {"room_id": current_room_id})
-                            self._send_to_client(client_fileno, {"type": "game_start_ack", "message": msg})
-                            self._broadcast_lobby_update()
-                    else:
-                        self._send_to_client(client_fileno, {"type": "error", "message": "Only the room owner can start the game."})
-                else:
-                    self._send_to_client(client_fileno, {"type": "error", "message": "Not in a room to start a game."})
-            
-            
-            elif mtype == "clue":
-                word = message.get("word")
-                number = message.get("number")
-                if current_room_id:
-                    room = self.rooms.get(current_room_id)
-                    if room and room.game_in_progress:
-                        success, msg = room.process_clue(client_fileno, word, number)
-                        success, msg = room.process_guess(client_fileno, word)
-                        if not success:
-                            self._send_to_client(client_fileno, {
-                                "type": "guess_feedback",
-                                "message": msg,
-                                "guess": word,
-                                "clue": room.clue_word,
-                                "team": player_obj.team,
-                                "turn": room.turn
-                            })
-                    else:
-                        self._send_to_client(client_fileno, {"type": "error", "message": "No game in progress in this room."})
-                else:
-                    self._send_to_client(client_fileno, {"type": "error", "message": "Not in a room."})
-
-
-
-            elif mtype == "guess":
-                word = message.get("word")
-                if current_room_id:
-                    room = self.rooms.get(current_room_id)
-                    if room and room.game_in_progress:
-                        success, msg = room.process_guess(client_fileno, word)
-                        self.mongo_logger.log_event("guess_made", {"room_id": current_room_id, "player_fileno": client_fileno, "player_name": client_name, "guessed_word": word, "result": msg})
-                        self._send_to_client(client_fileno, {"type": "info", "message": msg})
-                        if success:
-                            self._broadcast_game_state_to_room(current_room_id)
-                    else:
-                        self._send_to_client(client_fileno, {"type": "error", "message": "No game in progress in this room."})
-                else:
-                    self._send_to_client(client_fileno, {"type": "error", "message": "Not in a room."})
-            
-            elif mtype == "end_turn":
-                if current_room_id:
-                    room = self.rooms.get(current_room_id)
-                    if room and room.game_in_progress:
-                        success, msg = room.process_end_turn(client_fileno)
-                        if not success:
-                            self._send_to_client(client_fileno, {
-                                "type": "guess_feedback",
-                                "message": msg,
-                                "guess": word,
-                                "clue": room.clue_word,
-                                "team": player_obj.team,
-                                "turn": room.turn
-                            })
-                    else:
-                        self._send_to_client(client_fileno, {"type": "error", "message": "No game in progress in this room."})
-                else:
-                    self._send_to_client(client_fileno, {"type": "error", "message": "Not in a room."})
-            
+            else:
+                self._send_to_client(client_fileno, {"type": "error", "message": "Only the room owner can start the game."})
+        else:
+            self._send_to_client(client_fileno, {"type": "error", "message": "Not in a room to start a game."})
 
+    def _on_clue(self, client_fileno, player_obj, message):
+        current_room_id = player_obj.room_id
+        word = message.get("word")
+        number = message.get("number")
+        if current_room_id:
+            room = self.rooms.get(current_room_id)
+            if room and room.game_in_progress:
+                success, msg = room.process_clue(client_fileno, word, number)
+                if success:
+                    self._broadcast_game_state_to_room(current_room_id)
+                else:
+                    self._send_to_client(client_fileno, {
+                        "type": "guess_feedback",
+                        "message": msg,
+                        "guess": word,
+                        "clue": room.clue_word,
+                        "team": player_obj.team,
+                        "turn": room.turn
+                    })
+            else:
+                self._send_to_client(client_fileno, {"type": "error", "message": "No game in progress in this room."})
+        else:
+            self._send_to_client(client_fileno, {"type": "error", "message": "Not in a room."})
 
+    def _on_guess(self, client_fileno, player_obj, message):
+        client_name = player_obj.name
+        current_room_id = player_obj.room_id
+        word = message.get("word")
+        if current_room_id:
+            room = self.rooms.get(current_room_id)
+            if room and room.game_in_progress:
+                success, msg = room.process_guess(client_fileno, word)
+                self.mongo_logger.log_event("guess_made", {"room_id": current_room_id, "player_fileno": client_fileno, "player_name": client_name, "guessed_word": word, "result": msg})
+                self._send_to_client(client_fileno, {"type": "info", "message": msg})
+                if success:
+                    self._broadcast_game_state_to_room(current_room_id)
+            else:
+                self._send_to_client(client_fileno, {"type": "error", "message": "No game in progress in this room."})
+        else:
+            self._send_to_client(client_fileno, {"type": "error", "message": "Not in a room."})
 
-            elif mtype == "refresh_lobby":
-                self._broadcast_lobby_update()
+    def _on_end_turn(self, client_fileno, player_obj, message):
+        current_room_id = player_obj.room_id
+        if current_room_id:
+            room = self.rooms.get(current_room_id)
+            if room and room.game_in_progress:
+                success, msg = room.process_end_turn(client_fileno)
+                if success:
+                    self._broadcast_game_state_to_room(current_room_id)
+                else:
+                    self._send_to_client(client_fileno, {
+                        "type": "guess_feedback",
+                        "message": msg,
+                        "guess": None,
+                        "clue": room.clue_word,
+                        "team": player_obj.team,
+                        "turn": room.turn
+                    })
             else:
-                print(f"Unknown message type from {client_name} ({client_fileno}): {mtype}")
+                self._send_to_client(client_fileno, {"type": "error", "message": "No game in progress in this room."})
+        else:
+            self._send_to_client(client_fileno, {"type": "error", "message": "Not in a room."})
+
+    def _on_refresh_lobby(self, client_fileno, player_obj, message):
+        self._broadcast_lobby_update()
 
     def _add_lobby_chat_message(self, message, is_system=False):
-        with self.lock:
-            prefix = "[SYSTEM] " if is_system else ""
-            self.lobby_chat.append(f"{prefix}{message}")
-            if len(self.lobby_chat) > 50:
-                self.lobby_chat = self.lobby_chat[-50:]
+        prefix = "[SYSTEM] " if is_system else ""
+        self.lobby_chat.append(f"{prefix}{message}")
+        self._lobby_dirty = True
 
     def _send_to_client(self, client_fileno, message):
-        with self.lock:
-            client_info = self.clients.get(client_fileno)
-            if client_info:
-                try:
-                    data = json.dumps(message).encode('utf-8')
-                    header = f"{len(data):<{HEADER_LENGTH}}".encode('utf-8')
-                    client_info["socket"].sendall(header + data)
-                except Exception as e:
-                    print(f"Error sending to client {client_fileno}: {e}")
-                    self._cleanup_client(client_fileno)
+        self._send_frame(client_fileno, _encode_frame(message))
+
+    def _send_frame(self, client_fileno, frame):
+        """Queues an already encoded frame, so a broadcast only encodes its message once.
+
+        An empty outbox is flushed straight away; whatever the socket does not take is sent
+        by the event loop once the socket is writable, so a slow client never blocks the others.
+        """
+        client_info = self.clients.get(client_fileno)
+        if not client_info:
+            return
+        outbox = client_info["outbox"]
+        flush = not outbox # Otherwise a flush is already waiting for EVENT_WRITE
+        header, body = frame
+        outbox.append(header)
+        outbox.append(body)
+        client_info["outbox_bytes"] += len(header) + len(body)
+        if client_info["outbox_bytes"] > MAX_OUTBOX_BYTES:
+            logger.warning("Client %s is not reading its messages, dropping it.", client_fileno)
+            self._cleanup_client(client_fileno)
+        elif flush:
+            self._flush_outbox(client_fileno)
+
+    def _flush_outbox(self, client_fileno):
+        """Sends as much of a client's queued buffers as the socket accepts without blocking.
+
+        Headers and bodies of several frames go out in a single sendmsg (writev) call where supported.
+        """
+        client_info = self.clients.get(client_fileno)
+        if not client_info:
+            return
+        client_sock = client_info["socket"]
+        outbox = client_info["outbox"]
+        try:
+            while outbox:
+                buffers = list(islice(outbox, SENDMSG_MAX_BUFFERS)) if HAS_SENDMSG else [outbox[0]]
+                offset = client_info["outbox_offset"]
+                if offset: # The first buffer was partly sent by the previous call
+                    buffers[0] = memoryview(buffers[0])[offset:]
+                sent = client_sock.sendmsg(buffers) if HAS_SENDMSG else client_sock.send(buffers[0])
+                client_info["outbox_bytes"] -= sent
+                partial = sent < sum(map(len, buffers)) # The socket buffer is full
+                sent += offset
+                while outbox and sent >= len(outbox[0]):
+                    sent -= len(outbox.popleft())
+                client_info["outbox_offset"] = sent
+                if partial:
+                    break
+        except BlockingIOError:
+            pass
+        except Exception as e:
+            logger.warning("Error sending to client %s: %s", client_fileno, e)
+            self._cleanup_client(client_fileno)
+            return
+        # Only ask for write readiness while there is something left to send
+        events = selectors.EVENT_READ | selectors.EVENT_WRITE if outbox else selectors.EVENT_READ
+        if self._sel.get_key(client_sock).events != events:
+            self._sel.modify(client_sock, events, data=client_fileno)
 
     def _broadcast_to_lobby(self, message):
-        with self.lock:
-            for fileno, client_info in self.clients.items():
-                if client_info["player_obj"].room_id is None:
-                    self._send_to_client(fileno, message)
+        frame = _encode_frame(message)
+        for fileno, client_info in list(self.clients.items()): # A failed send removes the client
+            if client_info["player_obj"].room_id is None:
+                self._send_frame(fileno, frame)
 
     def _broadcast_to_room(self, room_id, message):
-        with self.lock:
-            room = self.rooms.get(room_id)
-            if room:
-                for fileno in room.clients.keys():
-                    self._send_to_client(fileno, message)
+        room = self.rooms.get(room_id)
+        if room:
+            frame = _encode_frame(message)
+            for fileno in list(room.clients.keys()):
+                self._send_frame(fileno, frame)
 
-    def _broadcast_lobby_update(self):
-        with self.lock:
-            lobby_update_message = {
-                "type": "lobby_update",
-                "players": [p.name for p in self.connected_clients.values() if p.room_id is None],
-                "rooms": [room.get_room_info() for room in self.rooms.values()],
-                "chat": self.lobby_chat
-            }
-            self._broadcast_to_lobby(lobby_update_message)
-
-    def _update_clients_periodically(self):
-        while self.running:
-            self._broadcast_lobby_update()
-            with self.lock:
-                for room_id, room in list(self.rooms.items()):
-                    if room.game_in_progress:
-                        for client_fileno in list(room.clients.keys()):
-                            game_state_message = room.get_game_state_for_client(client_fileno)
-                            self._send_to_client(client_fileno, game_state_message)
-            time.sleep(0.1)
+    def _send_game_state_updates(self, room):
+        """Sends every client in the room what changed in its view, encoding identical messages only once."""
+        encoded = [] # (message, frame) pairs sent this round; clients with the same view get the same message
+        for client_fileno in list(room.clients.keys()):
+            game_state_message = room.get_game_state_update_for_client(client_fileno)
+            if not game_state_message: # None when the client's view is unchanged
+                continue
+            for sent_message, frame in encoded:
+                if sent_message == game_state_message: # Cheap, shared board views compare by identity
+                    break
+            else:
+                frame = _encode_frame(game_state_message)
+                encoded.append((game_state_message, frame))
+            self._send_frame(client_fileno, frame)
+
+    def _broadcast_lobby_update(self, periodic=False):
+        """Sends the lobby state to every client in the lobby, encoded once.
+
+        Periodic calls do nothing unless the lobby changed since the last update was sent.
+        """
+        if periodic and not self._lobby_dirty:
+            return
+        self._lobby_dirty = False
+        lobby_update_message = {
+            "type": "lobby_update",
+            "players": [p.name for p in self.connected_clients.values() if p.room_id is None],
+            "rooms": [room.get_room_info() for room in self.rooms.values()],
+            "chat": list(self.lobby_chat) # deque is not JSON serializable
+        }
+        frame = _encode_frame(lobby_update_message)
+        for fileno, client_info in list(self.clients.items()): # A failed send removes the client
+            if client_info["player_obj"].room_id is None:
+                self._send_frame(fileno, frame)
+
+    def _update_clients(self):
+        """Periodic push of the lobby and of every running game's state, called from the event loop."""
+        self._broadcast_lobby_update(periodic=True)
+        for room_id, room in list(self.rooms.items()):
+            if room.game_in_progress and room.consume_state_change(): # Idle rooms cost nothing per tick
+                self._send_game_state_updates(room)
 
     def _cleanup_client(self, client_fileno):
-        with self.lock:
-            if client_fileno in self.clients:
-                client_info = self.clients.pop(client_fileno)
-                player_obj = client_info["player_obj"]
-                client_name = player_obj.name
-                room_id = player_obj.room_id
-                self.mongo_logger.log_event("client_disconnected", {"fileno": client_fileno, "player_name": client_name})
-                if room_id:
-                    room = self.rooms.get(room_id)
-                    if room:
-                        room.remove_client(client_fileno)
-                        if not room.clients:
-                            del self.rooms[room_id]
-                            self.mongo_logger.log_event("room_deleted", {"room_id": room_id})
-                            print(f"Room {room_id} deleted as it is empty.")
-                self.connected_clients.pop(client_fileno, None)
-                try:
-                    client_info["socket"].close()
-                except Exception as e:
-                    print(f"Error closing socket during cleanup for {client_fileno}: {e}")
-                self._add_lobby_chat_message(f"{client_name} disconnected from the server.", is_system=True)
-                self._broadcast_lobby_update()
-                print(f"Cleaned up client {client_name} ({client_fileno}).")
+        if client_fileno in self.clients:
+            client_info = self.clients.pop(client_fileno)
+            player_obj = client_info["player_obj"]
+            client_name = player_obj.name
+            room_id = player_obj.room_id
+            self.mongo_logger.log_event("client_disconnected", {"fileno": client_fileno, "player_name": client_name})
+            if room_id:
+                room = self.rooms.get(room_id)
+                if room:
+                    room.remove_client(client_fileno)
+                    if not room.clients:
+                        del self.rooms[room_id]
+                        self.mongo_logger.log_event("room_deleted", {"room_id": room_id})
+                        logger.info("Room %s deleted as it is empty.", room_id)
+            self.connected_clients.pop(client_fileno, None)
+            self._names.discard(client_name)
+            try:
+                self._sel.unregister(client_info["socket"])
+            except (KeyError, ValueError):
+                pass # Never registered, or the selector is already closed
+            try:
+                client_info["socket"].close()
+            except Exception as e:
+                logger.warning("Error closing socket during cleanup for %s: %s", client_fileno, e)
+            self._add_lobby_chat_message(f"{client_name} disconnected from the server.", is_system=True)
+            self._broadcast_lobby_update()
+            logger.info("Cleaned up client %s (%s).", client_name, client_fileno)
 
     def _broadcast_game_state_to_room(self, room_id):
-        room = self.rooms.get(room_id)
-        if room:
-            for fileno in room.clients:
-                game_state = room.get_game_state_for_client(fileno)
-                self._send_to_client(fileno, game_state)
+        """Schedules the room's game state for the end of this event-loop round.
+
+        Changes from several messages handled in the same round then go out as a single update per client.
+        """
+        self._rooms_to_flush.add(room_id)
+
+    def _flush_game_states(self):
+        """Sends the game state of every room scheduled by _broadcast_game_state_to_room."""
+        room_ids = self._rooms_to_flush
+        self._rooms_to_flush = set()
+        for room_id in room_ids:
+            room = self.rooms.get(room_id) # Gone if its last player left later in the round
+            if room and room.consume_state_change():
+                self._send_game_state_updates(room)
@@ -14,4 +14,4 @@ from button import Button
 # --- Constants ---
 WIDTH, HEIGHT = 1000, 650
 FPS = 60
-HEADER_LENGTH = 10 # Must match server's HEADER_LENGTH
+HEADER_LENGTH = 4 # Must match server's HEADER_LENGTH
@@ -1,28 +1,38 @@
 import socket
 import threading
 import json
+import logging
 import time
 import random
+from collections import deque
 import traceback
 import select
 import pymongo
 from datetime import datetime
 
 from mongo_logger import MongoLogger
+
+logger = logging.getLogger("codenames.server") # Hot-path traces are logged at DEBUG and skipped cheaply otherwise
+
 # --- Constants ---
 HOST = '127.0.0.1'
 PORT = 5555
-HEADER_LENGTH = 10
+HEADER_LENGTH = 4
+CHAT_HISTORY = 50 # Chat messages kept per room, older ones are dropped
+FULL_SYNC_INTERVAL = 50 # Deltas sent to a client between two full snapshots
 
 
 # --- Game Logic (Simplified Codenames Board) ---
-ALL_WORDS = [
+ALL_WORDS = (
     "APPLE", "BAKER", "CLOUD", "DREAM", "EAGLE", "FENCE", "GLOVE", "HOUSE", "INDIA", "JUMBO",
     "KNIFE", "LAUNCH", "MISSION", "NEPTUNE", "ORBIT", "PULSE", "QUEEN", "ROBOT", "SATELLITE",
     "TIGER", "UMBRELLA", "VENUS", "VOYAGER", "ZORRO", "ZEBRA", "SPIDER", "MERCURY", "DESK",
     "DOG", "CAT", "STRAW", "GRAPE", "CAR", "PLANE", "DRIVE", "BIRD", "FISH", "CRANE", "BLOCK",
     "BOARD", "GAME", "PLAY", "RUN", "JUMP", "DANCE", "SING", "ART", "BOOK", "READ"
-]
+)
+
+# Standard Codenames distribution: 8 Red, 8 Blue, 7 Innocent, 2 Assassin
+BOARD_COLORS = ("red",) * 8 + ("blue",) * 8 + ("innocent",) * 7 + ("assassin",) * 2
 
 class GameRoom:
     def __init__(self, room_id, owner_fileno, server_instance, room_name="Unnamed Room"):
@@ -35,6 +45,7 @@ class GameRoom:
 
         # Game state specific variables
         self.board = [] # List of {"word": str, "color": str, "revealed": bool}
+        self._word_index = {} # Upper-case word -> its card in self.board, rebuilt with each board
         self.red_score = 0
         self.blue_score = 0
         self.turn = "" # "red" or "blue"
@@ -47,16 +58,27 @@ class GameRoom:
         # Role assignments (client filenos)
         self.red_spymaster_fileno = None
         self.blue_spymaster_fileno = None
-        self.red_operatives_filenos = []
-        self.blue_operatives_filenos = []
-
-        self.chat_messages = [] # Room-specific chat
-        self.lock = threading.RLock() # Re-entrant lock for thread safety
+        self.red_operatives_filenos = set() # Sets: membership is checked on every guess and end turn
+        self.blue_operatives_filenos = set()
+        self._current_turn_operatives = self.red_operatives_filenos # Whichever of the two sets is on turn, swapped with the turn
+
+        self.chat_messages = deque(maxlen=CHAT_HISTORY) # Room-specific chat, oldest messages evicted on append
+        self._last_sent_state = {} # client_fileno -> (last game state sent, deltas sent since its last full snapshot)
+        self._state_dirty = True # Game state changed since the last broadcast
+        # (common fields, (operative board, spymaster board)) shared by every client's update. Cached under the lock,
+        # dropped by _mark_state_changed and rebuilt on the next read
+        self._state_snapshot = None
+        self._board_views = None # (operative view, spymaster view) of the board, rebuilt after a reveal or new board
+        self._room_info_cache = None # get_room_info result, dropped when the players or game status change
+        self.lock = threading.Lock() # Taken once by each public method; the _helpers they call expect it held
 
     def add_client(self, client_fileno, client_name):
         with self.lock:
             if client_fileno not in self.clients:
                 self.clients[client_fileno] = client_name
+                self._last_sent_state.pop(client_fileno, None) # Start the newcomer from a full snapshot
+                self._mark_state_changed()
+                self._room_info_cache = None
                 # Update the Player object's room_id
                 player_obj = self.server.connected_clients.get(client_fileno)
                 if player_obj:
@@ -64,8 +86,8 @@ class GameRoom:
                     player_obj.team = None # Reset assigned team when joining room
                     player_obj.role = None # Reset assigned role when joining room
                     player_obj.chosen_team = None # Reset chosen team when joining room
-                self.add_chat_message(f"{client_name} joined the room.")
-                print(f"Client {client_name} ({client_fileno}) joined room {self.room_id}.")
+                self._append_chat_message(f"{client_name} joined the room.")
+                logger.info("Client %s (%s) joined room %s.", client_name, client_fileno, self.room_id)
                 return True
             return False
 
@@ -73,6 +95,9 @@ class GameRoom:
         with self.lock:
             if client_fileno in self.clients:
                 client_name = self.clients.pop(client_fileno)
+                self._last_sent_state.pop(client_fileno, None)
+                self._mark_state_changed()
+                self._room_info_cache = None
                 # Reset the Player object's room_id, team, and role
                 player_obj = self.server.connected_clients.get(client_fileno)
                 if player_obj:
@@ -81,8 +106,8 @@ class GameRoom:
                     player_obj.role = None
                     player_obj.chosen_team = None # Reset chosen team when leaving room
 
-                self.add_chat_message(f"{client_name} left the room.")
-                print(f"Client {client_name} ({client_fileno}) left room {self.room_id}.")
+                self._append_chat_message(f"{client_name} left the room.")
+                logger.info("Client %s (%s) left room %s.", client_name, client_fileno, self.room_id)
                 
                 # If game was in progress and a spymaster left, end game (simplistic)
                 if self.game_in_progress:
@@ -90,8 +115,8 @@ class GameRoom:
                        client_fileno == self.blue_spymaster_fileno:
                         self.game_over = True
                         self.winner = "draw" # Or assign winner to remaining team
-                        self.add_chat_message("A spymaster left. Game ended prematurely.", is_system=True)
-                        print(f"Room {self.room_id}: Game ended due to spymaster leaving.")
+                        self._append_chat_message("A spymaster left. Game ended prematurely.", is_system=True)
+                        logger.info("Room %s: Game ended due to spymaster leaving.", self.room_id)
                 
                 # If no more players, the room might be dissolved by the server logic
                 return True
@@ -99,13 +124,17 @@ class GameRoom:
 
     def add_chat_message(self, message, is_system=False):
         with self.lock:
-            prefix = "[SYSTEM] " if is_system else ""
-            self.chat_messages.append(f"{prefix}{message}")
-            # Keep chat history to a reasonable length
-            if len(self.chat_messages) > 50:
-                self.chat_messages = self.chat_messages[-50:]
+            self._append_chat_message(message, is_system)
+
+    def _append_chat_message(self, message, is_system=False):
+        """add_chat_message for callers already holding the lock."""
+        prefix = "[SYSTEM] " if is_system else ""
+        self.chat_messages.append(f"{prefix}{message}")
 
     def get_room_info(self):
+        room_info = self._room_info_cache # Published dicts are never mutated, so no lock is needed to read one
+        if room_info is not None:
+            return room_info
         with self.lock:
             room_info = {
                 "id": self.room_id,
@@ -116,36 +145,20 @@ class GameRoom:
                 "owner_fileno": self.owner_fileno # Explicitly include owner_fileno
             }
             # print(f"[SERVER_DEBUG] get_room_info for room {self.room_id}: {room_info}") # DEBUG PRINT
+            self._room_info_cache = room_info
             return room_info
             
     def _generate_random_board(self):
         """Generates a new Codenames board with assigned colors."""
         available_words = random.sample(ALL_WORDS, 25) # Pick 25 unique words
-        
-        # Standard Codenames distribution (assuming Red starts)
-        # 8 Red, 8 Blue, 7 Innocent, 2 Assassin
-        colors_distribution = ["red"] * 8 + ["blue"] * 8 + ["innocent"] * 7 + ["assassin"] * 2
-        random.shuffle(colors_distribution)
-
-        board = []
-        current_red_score = 0
-        current_blue_score = 0
-
-        for i in range(25):
-            word = available_words[i]
-            color = colors_distribution[i]
-            board.append({
-                "word": word,
-                "color": color,
-                "revealed": False
-            })
-            if color == "red":
-                current_red_score += 1
-            elif color == "blue":
-                current_blue_score += 1
-        
-        self.red_score = current_red_score # Should be 9
-        self.blue_score = current_blue_score # Should be 8
+        colors_distribution = random.sample(BOARD_COLORS, len(BOARD_COLORS)) # Shuffled copy of the fixed distribution
+
+        board = [{"word": word, "color": color, "revealed": False} for word, color in zip(available_words, colors_distribution)]
+
+        # The distribution is fixed, so the starting scores are too
+        self.red_score = BOARD_COLORS.count("red")
+        self.blue_score = BOARD_COLORS.count("blue")
+        self._word_index = {card["word"]: card for card in board} # ALL_WORDS are already upper case
         return board
 
     def start_game(self):
@@ -157,6 +170,9 @@ class GameRoom:
 
             self.game_in_progress = True
             self.board = self._generate_random_board()
+            self._last_sent_state.clear() # Everyone gets the new board as a full snapshot
+            self._mark_state_changed(board_changed=True)
+            self._room_info_cache = None
             self.turn = random.choice(["red", "blue"]) # Randomly decide who starts
             self.clue_word = ""
             self.clue_number = 0
@@ -164,22 +180,25 @@ class GameRoom:
             self.game_over = False
             self.winner = None
 
-            self._assign_teams_and_roles() # Call the new assignment method
+            red_spymaster_name, blue_spymaster_name = self._assign_teams_and_roles() # Call the new assignment method
+            self._update_current_turn_operatives()
             
-            self.add_chat_message("A new game has started!", is_system=True)
-            self.add_chat_message(f"Red Spymaster: {self.server.connected_clients[self.red_spymaster_fileno].name if self.red_spymaster_fileno else 'None'}", is_system=True)
-            self.add_chat_message(f"Blue Spymaster: {self.server.connected_clients[self.blue_spymaster_fileno].name if self.blue_spymaster_fileno else 'None'}", is_system=True)
-            print(f"Room {self.room_id}: Game started. Roles assigned.")
+            self._append_chat_message("A new game has started!", is_system=True)
+            self._append_chat_message(f"Red Spymaster: {red_spymaster_name}", is_system=True)
+            self._append_chat_message(f"Blue Spymaster: {blue_spymaster_name}", is_system=True)
+            logger.info("Room %s: Game started. Roles assigned.", self.room_id)
             return True, "Game started!"
 
     def _assign_teams_and_roles(self):
-        """Assigns players to opposing teams, respecting player choice if available."""
-        current_room_clients = list(self.clients.keys())
-        random.shuffle(current_room_clients)  # Shuffle for randomness
+        """Assigns players to opposing teams, respecting player choice if available.
+        Returns the (red, blue) spymaster names, 'None' for a team without one."""
+        current_room_clients = random.sample(list(self.clients), len(self.clients)) # Copied and shuffled in one pass
+        connected_clients = self.server.connected_clients
+        players = {fileno: connected_clients.get(fileno) for fileno in current_room_clients} # Looked up once for all passes
 
         # Reset all roles and teams for a clean assignment
         for fileno in current_room_clients:
-            player_obj = self.server.connected_clients.get(fileno)
+            player_obj = players.get(fileno)
             if player_obj:
                 player_obj.team = None
                 player_obj.role = None
@@ -187,8 +206,6 @@ class GameRoom:
         # Clear previous assignments
         self.red_spymaster_fileno = None
         self.blue_spymaster_fileno = None
-        self.red_operatives_filenos = []
-        self.blue_operatives_filenos = []
 
         # Separate players based on their chosen team
         chosen_red_players = []
@@ -196,7 +213,7 @@ class GameRoom:
         no_choice_players = []
 
         for fileno in current_room_clients:
-            player_obj = self.server.connected_clients.get(fileno)
+            player_obj = players.get(fileno)
             if player_obj:
                 if player_obj.chosen_team == "red":
                     chosen_red_players.append(fileno)
@@ -223,70 +240,55 @@ class GameRoom:
         if not temp_red_players and temp_blue_players:
             # Move one player from blue to red if red is empty
             temp_red_players.append(temp_blue_players.pop(0))
-            print(f"[DEBUG_ASSIGN] Moved a player from Blue to Red to ensure Red team is not empty.")
+            logger.debug("[DEBUG_ASSIGN] Moved a player from Blue to Red to ensure Red team is not empty.")
         if not temp_blue_players and temp_red_players:
             # Move one player from red to blue if blue is empty
             temp_blue_players.append(temp_red_players.pop(0))
-            print(f"[DEBUG_ASSIGN] Moved a player from Red to Blue to ensure Blue team is not empty.")
+            logger.debug("[DEBUG_ASSIGN] Moved a player from Red to Blue to ensure Blue team is not empty.")
 
         # Update player objects with their assigned teams
         for fileno in temp_red_players:
-            player_obj = self.server.connected_clients.get(fileno)
+            player_obj = players.get(fileno)
             if player_obj:
                 player_obj.team = "red"
-                print(f"[DEBUG_ASSIGN] Player {player_obj.name} (fileno {fileno}) assigned to Red team.")
+                logger.debug("[DEBUG_ASSIGN] Player %s (fileno %s) assigned to Red team.", player_obj.name, fileno)
         for fileno in temp_blue_players:
-            player_obj = self.server.connected_clients.get(fileno)
+            player_obj = players.get(fileno)
             if player_obj:
                 player_obj.team = "blue"
-                print(f"[DEBUG_ASSIGN] Player {player_obj.name} (fileno {fileno}) assigned to Blue team.")
+                logger.debug("[DEBUG_ASSIGN] Player %s (fileno %s) assigned to Blue team.", player_obj.name, fileno)
 
         # Assign spymasters: pick one from each team
         if temp_red_players:
             self.red_spymaster_fileno = random.choice(temp_red_players)
-            player_obj = self.server.connected_clients.get(self.red_spymaster_fileno)
+            player_obj = players.get(self.red_spymaster_fileno)
             if player_obj:
                 player_obj.role = "spymaster"
-                print(f"[DEBUG_ASSIGN] {player_obj.name} (fileno {self.red_spymaster_fileno}) assigned as Red Spymaster.")
+                logger.debug("[DEBUG_ASSIGN] %s (fileno %s) assigned as Red Spymaster.", player_obj.name, self.red_spymaster_fileno)
         if temp_blue_players:
             self.blue_spymaster_fileno = random.choice(temp_blue_players)
-            player_obj = self.server.connected_clients.get(self.blue_spymaster_fileno)
+            player_obj = players.get(self.blue_spymaster_fileno)
             if player_obj:
                 player_obj.role = "spymaster"
-                print(f"[DEBUG_ASSIGN] {player_obj.name} (fileno {self.blue_spymaster_fileno}) assigned as Blue Spymaster.")
-
-        # Assign remaining players as operatives
-        for fileno in temp_red_players:
-            if fileno != self.red_spymaster_fileno:
-                self.red_operatives_filenos.append(fileno)
-                player_obj = self.server.connected_clients.get(fileno)
-                if player_obj:
-                    player_obj.role = "operative"
-                    print(f"[DEBUG_ASSIGN] {player_obj.name} (fileno {fileno}) assigned as Red Operative.")
-        
-        for fileno in temp_blue_players:
-            if fileno != self.blue_spymaster_fileno:
-                self.blue_operatives_filenos.append(fileno)
-                player_obj = self.server.connected_clients.get(fileno)
-                if player_obj:
-                    player_obj.role = "operative"
-                    print(f"[DEBUG_ASSIGN] {player_obj.name} (fileno {fileno}) assigned as Blue Operative.")
-
-        # Crucial: If a spymaster is the only player on their team, they also act as an operative.
-        # This handles 2-player competitive mode where each player is both spymaster and operative.
-        # Ensure spymaster is always in their operative list for the client to correctly identify as operative
-        if self.red_spymaster_fileno and self.red_spymaster_fileno not in self.red_operatives_filenos:
-            self.red_operatives_filenos.append(self.red_spymaster_fileno)
-            player_obj = self.server.connected_clients.get(self.red_spymaster_fileno)
-            if player_obj and player_obj.role != "spymaster": # Only if not already spymaster
-                player_obj.role = "operative" # This line might be redundant if spymaster is primary role
-        
-        if self.blue_spymaster_fileno and self.blue_spymaster_fileno not in self.blue_operatives_filenos:
-            self.blue_operatives_filenos.append(self.blue_spymaster_fileno)
-            player_obj = self.server.connected_clients.get(self.blue_spymaster_fileno)
-            if player_obj and player_obj.role != "spymaster": # Only if not already spymaster
-                player_obj.role = "operative" # This line might be redundant if spymaster is primary role
-
+                logger.debug("[DEBUG_ASSIGN] %s (fileno %s) assigned as Blue Spymaster.", player_obj.name, self.blue_spymaster_fileno)
+
+        # Assign remaining players as operatives. The operative sets hold the whole team, spymaster included:
+        # in 2-player competitive mode a spymaster alone on their team also guesses, keeping the spymaster role
+        self.red_operatives_filenos = set(temp_red_players)
+        self.blue_operatives_filenos = set(temp_blue_players)
+        for team, team_players, spymaster_fileno in (("Red", temp_red_players, self.red_spymaster_fileno),
+                                                     ("Blue", temp_blue_players, self.blue_spymaster_fileno)):
+            for fileno in team_players:
+                if fileno != spymaster_fileno:
+                    player_obj = players.get(fileno)
+                    if player_obj:
+                        player_obj.role = "operative"
+                        logger.debug("[DEBUG_ASSIGN] %s (fileno %s) assigned as %s Operative.", player_obj.name, fileno, team)
+
+        red_spymaster = players.get(self.red_spymaster_fileno)
+        blue_spymaster = players.get(self.blue_spymaster_fileno)
+        return (red_spymaster.name if red_spymaster else 'None',
+                blue_spymaster.name if blue_spymaster else 'None')
 
         # print(f"Roles assigned for room {self.room_id}:")
         # print(f"  Red Spymaster: {self.server.connected_clients[self.red_spymaster_fileno].name if self.red_spymaster_fileno and self.red_spymaster_fileno in self.server.connected_clients else 'None'}")
@@ -295,44 +297,88 @@ class GameRoom:
         # print(f"  Blue Operatives: {[self.server.connected_clients[f].name for f in self.blue_operatives_filenos if f in self.server.connected_clients]}")
 
 
-    def get_game_state_for_client(self, client_fileno):
-        """Prepares the game state dictionary for a specific client."""
+    def _mark_state_changed(self, board_changed=False):
+        """Flags the game state for the next broadcast and drops the cached parts that are now stale."""
+        self._state_dirty = True
+        self._state_snapshot = None
+        if board_changed:
+            self._board_views = None
+
+    def _personalize_state(self, snapshot, client_fileno):
+        """Adds the client's own board view, team and role to a published state snapshot."""
+        common_state, board_views = snapshot
+
+        # Retrieve the player's actual team and role from the Player object
+        player_obj = self.server.connected_clients.get(client_fileno)
+        
+        # Determine if the requesting client is a spymaster based on their assigned role
+        is_spymaster_for_this_client = (player_obj and player_obj.role == "spymaster")
+
+        return dict(common_state,
+            board=board_views[bool(is_spymaster_for_this_client)],
+            is_spymaster=is_spymaster_for_this_client, # Crucial for client UI
+            my_team=player_obj.team if player_obj else "neutral", # Send client's assigned team
+            my_role=player_obj.role if player_obj else "spectator", # Send client's assigned role
+        )
+
+    def _publish_state_snapshot(self):
+        """Rebuilds the shared part of the game state and caches it as _state_snapshot. Caller holds the lock."""
+        # There are only two views of the board, so they are built once per change and shared by every client.
+        # Cards are copied, so views already handed out never see later reveals.
+        if self._board_views is None:
+            operative_view = [dict(card) if card["revealed"] else {"word": card["word"], "revealed": False} # Operatives only see the word and revealed status
+                              for card in self.board]
+            spymaster_view = [dict(card) for card in self.board] # Spymasters see full info
+            self._board_views = (operative_view, spymaster_view)
+
+        snapshot = (self._build_common_state(), self._board_views)
+        self._state_snapshot = snapshot
+        return snapshot
+
+    def _build_common_state(self):
+        """The part of the game state that is the same for every client."""
+        return {
+            "type": "game_state_update",
+            "red_score": self.red_score,
+            "blue_score": self.blue_score,
+            "turn": self.turn,
+            "clue_word": self.clue_word,
+            "clue_number": self.clue_number,
+            "guesses_made": self.guesses_made,
+            "game_over": self.game_over,
+            "winner": self.winner,
+            "spymaster_red": self.red_spymaster_fileno,
+            "spymaster_blue": self.blue_spymaster_fileno,
+            "operative_red": sorted(self.red_operatives_filenos), # Sorted so unchanged states serialize identically
+            "operative_blue": sorted(self.blue_operatives_filenos),
+        }
+
+    def consume_state_change(self):
+        """Returns whether the game state changed since the previous call, and clears the flag."""
         with self.lock:
-            board_for_client = []
-            
-            # Retrieve the player's actual team and role from the Player object
-            player_obj = self.server.connected_clients.get(client_fileno)
-            
-            # Determine if the requesting client is a spymaster based on their assigned role
-            is_spymaster_for_this_client = (player_obj and player_obj.role == "spymaster")
+            changed = self._state_dirty
+            self._state_dirty = False
+            return changed
 
-            for card in self.board:
-                if card["revealed"] or is_spymaster_for_this_client:
-                    # Spymasters and revealed cards show full info
-                    board_for_client.append(card)
-                else:
-                    # Operatives only see the word and revealed status
-                    board_for_client.append({"word": card["word"], "revealed": card["revealed"]})
-
-            return {
-                "type": "game_state_update",
-                "board": board_for_client,
-                "red_score": self.red_score,
-                "blue_score": self.blue_score,
-                "turn": self.turn,
-                "clue_word": self.clue_word,
-                "clue_number": self.clue_number,
-                "guesses_made": self.guesses_made,
-                "game_over": self.game_over,
-                "winner": self.winner,
-                "is_spymaster": is_spymaster_for_this_client, # Crucial for client UI
-                "spymaster_red": self.red_spymaster_fileno,
-                "spymaster_blue": self.blue_spymaster_fileno,
-                "operative_red": self.red_operatives_filenos,
-                "operative_blue": self.blue_operatives_filenos,
-                "my_team": player_obj.team if player_obj else "neutral", # Send client's assigned team
-                "my_role": player_obj.role if player_obj else "spectator", # Send client's assigned role
-            }
+    def get_game_state_update_for_client(self, client_fileno):
+        """Returns the message that brings a client's view up to date, or None if nothing changed since the last one.
+
+        The first update, and the one after every FULL_SYNC_INTERVAL deltas, is a full game_state_update; the others are
+        game_state_delta messages holding only the changed top-level fields and [index, card] pairs for changed cards.
+        """
+        with self.lock:
+            state = self._personalize_state(self._state_snapshot or self._publish_state_snapshot(), client_fileno)
+            last_state, updates = self._last_sent_state.get(client_fileno, (None, FULL_SYNC_INTERVAL))
+            if updates >= FULL_SYNC_INTERVAL or len(last_state["board"]) != len(state["board"]):
+                self._last_sent_state[client_fileno] = (state, 0)
+                return state
+
+            changes = {key: value for key, value in state.items() if key != "board" and last_state.get(key) != value}
+            cards = [[index, card] for index, (card, last_card) in enumerate(zip(state["board"], last_state["board"])) if card != last_card]
+            if not changes and not cards:
+                return None # Nothing is sent, so this doesn't count towards the next full snapshot
+            self._last_sent_state[client_fileno] = (state, updates + 1)
+            return {"type": "game_state_delta", "changes": changes, "cards": cards}
 
     def process_clue(self, client_fileno, word, number):
         with self.lock:
@@ -355,14 +401,11 @@ class GameRoom:
 
             self.clue_word = word.upper()
             self.clue_number = number
+            self._mark_state_changed()
             self.guesses_made = 0 # Reset guesses for the new clue
-            self.add_chat_message(f"{self.clients.get(client_fileno, 'Unknown')} gave clue: '{self.clue_word}'")
-            print(f"Room {self.room_id}: Clue '{word}' ({number}) given by {self.clients.get(client_fileno, 'Unknown')}.")
-
-
-
-            for card in self.board:
-                print(f"cycle word:{card["word"].lower()}")
+            name = self.clients.get(client_fileno, 'Unknown')
+            self._append_chat_message(f"{name} gave clue: '{self.clue_word}'")
+            logger.info("Room %s: Clue '%s' (%s) given by %s.", self.room_id, word, number, name)
 
             
             # self.add_chat_message(f"{self.clients.get(client_fileno, 'Unknown')} process clue: '{self.clue_word}' ({self.clue_number})")
@@ -373,65 +416,56 @@ class GameRoom:
 
             return True, "Clue received."
     def process_guess(self, client_fileno, guessed_word):
-        print(f"--- Entering process_guess for client {client_fileno}, guessed_word: '{guessed_word}' ---")
+        logger.debug("--- Entering process_guess for client %s, guessed_word: '%s' ---", client_fileno, guessed_word)
 
         with self.lock:
-            print(f"Acquired lock for processing guess.")
+            logger.debug("Acquired lock for processing guess.")
             if self.game_over:
-                print(f"Game is over. Returning False.")
+                logger.debug("Game is over. Returning False.")
                 return False, "Game is over."
             if not self.game_in_progress:
-                print(f"Game not in progress. Returning False.")
+                logger.debug("Game not in progress. Returning False.")
                 return False, "Game not in progress."
 
             # Check if a clue has been given yet
             if not self.clue_word:
-                print(f"No clue has been given yet. Returning False.")
+                logger.debug("No clue has been given yet. Returning False.")
                 return False, "No clue has been given yet."
-            print(f"Current clue word: '{self.clue_word}', clue number: {self.clue_number}")
+            logger.debug("Current clue word: '%s', clue number: %s", self.clue_word, self.clue_number)
 
             # Check if it's the correct Operative's turn
-            is_operative_of_current_team = False
-            if self.turn == "red" and client_fileno in self.red_operatives_filenos:
-                is_operative_of_current_team = True
-                print(f"Client {client_fileno} is a red operative and it's red's turn.")
-            elif self.turn == "blue" and client_fileno in self.blue_operatives_filenos:
-                is_operative_of_current_team = True
-                print(f"Client {client_fileno} is a blue operative and it's blue's turn.")
-            
-            if not is_operative_of_current_team:
-                print(f"Client {client_fileno} is not an operative for the current turn ({self.turn}). Returning False.")
+            if client_fileno not in self._current_turn_operatives:
+                logger.debug("Client %s is not an operative for the current turn (%s). Returning False.", client_fileno, self.turn)
                 return False, "It's not your team's turn or you are not an operative for the current turn."
 
             # Check if guess limit reached (clue_number + 1 bonus guess)
-            print(f"Guesses made: {self.guesses_made}, Allowed guesses: {self.clue_number + 1}")
+            logger.debug("Guesses made: %s, Allowed guesses: %s", self.guesses_made, self.clue_number + 1)
             if self.guesses_made >= (self.clue_number + 1):
-                print(f"Guess limit reached. Returning False.")
+                logger.debug("Guess limit reached. Returning False.")
                 # If they try to guess beyond their allowed guesses, it's an invalid move
                 # and doesn't end the turn, but tells them they can't.
                 return False, "You have used all your guesses for this clue. Please end your turn."
 
-            found_card = None
-            print(f"Searching for '{guessed_word}' on the board.")
-            for card in self.board:
-                if card["word"].lower() == guessed_word.lower():
-                    found_card = card
-                    print(f"Found card: {found_card['word']} with color {found_card['color']}.")
-                    break
+            logger.debug("Searching for '%s' on the board.", guessed_word)
+            found_card = self._word_index.get(guessed_word.upper()) # Guesses are case-insensitive
+            if found_card:
+                logger.debug("Found card: %s with color %s.", found_card['word'], found_card['color'])
 
+            name = self.clients.get(client_fileno, 'Unknown')
+            self._mark_state_changed(board_changed=True) # Every guess past this point changes the game state
             if not found_card:
                 self.guesses_made += 1 # A guess on a non-existent word still counts towards total guesses
-                self.add_chat_message(f"{self.clients.get(client_fileno, 'Unknown')} guessed '{guessed_word}' (not on board).")
-                print(f"Room {self.room_id}: {self.clients.get(client_fileno, 'Unknown')} guessed '{guessed_word}' (not on board). Guesses made: {self.guesses_made}.")
+                self._append_chat_message(f"{name} guessed '{guessed_word}' (not on board).")
+                logger.info("Room %s: %s guessed '%s' (not on board). Guesses made: %s.", self.room_id, name, guessed_word, self.guesses_made)
                 # If they guess a word not on the board, the turn usually ends immediately.
-                print(f"Word not found on board. Ending turn.")
+                logger.debug("Word not found on board. Ending turn.")
                 self._end_turn()    
                 return False, "Word not found on the board. Your turn ends."
 
 
             alreadyRevealedCart = False
             if found_card["revealed"]:
-                print(f"Card '{found_card['word']}' already revealed. Returning False.")
+                logger.debug("Card '%s' already revealed. Returning False.", found_card['word'])
                 alreadyRevealedCart = True
                 result_message = ""
                 turn_ends = False
@@ -440,106 +474,107 @@ class GameRoom:
             if not alreadyRevealedCart:
                 found_card["revealed"] = True
                 self.guesses_made += 1
-                print(f"Card '{found_card['word']}' revealed. Guesses made: {self.guesses_made}.")
+                logger.debug("Card '%s' revealed. Guesses made: %s.", found_card['word'], self.guesses_made)
 
                 result_message = ""
                 turn_ends = False
 
-                print(f"Guessed card color: {found_card['color']}, Current turn: {self.turn}")
+                logger.debug("Guessed card color: %s, Current turn: %s", found_card['color'], self.turn)
                 if found_card["color"] == self.turn:
                     # Correct team's word
                     if self.turn == "red":
                         self.red_score -= 1
-                        print(f"Red team guessed own word. Red score: {self.red_score}")
+                        logger.debug("Red team guessed own word. Red score: %s", self.red_score)
                     else: # blue
                         self.blue_score -= 1
-                        print(f"Blue team guessed own word. Blue score: {self.blue_score}")
-                    result_message = f"{self.clients.get(client_fileno, 'Unknown')} guessed their own word: {found_card['word']}."
-                    self.add_chat_message(result_message)
+                        logger.debug("Blue team guessed own word. Blue score: %s", self.blue_score)
+                    result_message = f"{name} guessed their own word: {found_card['word']}."
+                    self._append_chat_message(result_message)
                 elif found_card["color"] == "innocent":
                     # Innocent bystander
-                    result_message = f"{self.clients.get(client_fileno, 'Unknown')} guessed an Innocent bystander: {found_card['word']}. Turn ends!"
-                    self.add_chat_message(result_message)
+                    result_message = f"{name} guessed an Innocent bystander: {found_card['word']}. Turn ends!"
+                    self._append_chat_message(result_message)
                     turn_ends = True
-                    print(f"Innocent bystander guessed. Turn ends: {turn_ends}.")
+                    logger.debug("Innocent bystander guessed. Turn ends: %s.", turn_ends)
                 elif found_card["color"] == "assassin":
                     # Assassin
-                    result_message = f"{self.clients.get(client_fileno, 'Unknown')} guessed the Assassin word: {found_card['word']}! Game Over!"
-                    self.add_chat_message(result_message)
+                    result_message = f"{name} guessed the Assassin word: {found_card['word']}! Game Over!"
+                    self._append_chat_message(result_message)
                     self.game_over = True
                     self.winner = "blue" if self.turn == "red" else "red" # Assassin causes immediate loss for guessing team
                     turn_ends = True # Game over, so turn ends
-                    print(f"Assassin guessed! Game Over: {self.game_over}, Winner: {self.winner}. Turn ends: {turn_ends}.")
+                    logger.debug("Assassin guessed! Game Over: %s, Winner: %s. Turn ends: %s.", self.game_over, self.winner, turn_ends)
                 else:
                     # Opponent's word
                     if self.turn == "red": # Red guessed blue's word
                         self.blue_score -= 1
-                        print(f"Red guessed opponent's word. Blue score: {self.blue_score}")
+                        logger.debug("Red guessed opponent's word. Blue score: %s", self.blue_score)
                     else: # Blue guessed red's word
                         self.red_score -= 1
-                        print(f"Blue guessed opponent's word. Red score: {self.red_score}")
-                    result_message = f"{self.clients.get(client_fileno, 'Unknown')} guessed opponent's word: {found_card['word']}. Turn ends!"
-                    self.add_chat_message(result_message)
+                        logger.debug("Blue guessed opponent's word. Red score: %s", self.red_score)
+                    result_message = f"{name} guessed opponent's word: {found_card['word']}. Turn ends!"
+                    self._append_chat_message(result_message)
                     turn_ends = True
-                    print(f"Opponent's word guessed. Turn ends: {turn_ends}.")
+                    logger.debug("Opponent's word guessed. Turn ends: %s.", turn_ends)
                 
-                print(f"Room {self.room_id}: {result_message}")
+                logger.info("Room %s: %s", self.room_id, result_message)
 
                 # Check for win conditions
-                print(f"Checking win conditions. Red score: {self.red_score}, Blue score: {self.blue_score}.")
+                logger.debug("Checking win conditions. Red score: %s, Blue score: %s.", self.red_score, self.blue_score)
                 if self.red_score == 0:
                     self.game_over = True
                     self.winner = "red"
-                    self.add_chat_message("RED TEAM WINS!", is_system=True)
-                    print(f"Room {self.room_id}: RED TEAM WINS! Game Over: {self.game_over}, Winner: {self.winner}.")
+                    self._append_chat_message("RED TEAM WINS!", is_system=True)
+                    logger.info("Room %s: RED TEAM WINS! Game Over: %s, Winner: %s.", self.room_id, self.game_over, self.winner)
                 elif self.blue_score == 0:
                     self.game_over = True
                     self.winner = "blue"
-                    self.add_chat_message("BLUE TEAM WINS!", is_system=True)
-                    print(f"Room {self.room_id}: BLUE TEAM WINS! Game Over: {self.game_over}, Winner: {self.winner}.")
+                    self._append_chat_message("BLUE TEAM WINS!", is_system=True)
+                    logger.info("Room %s: BLUE TEAM WINS! Game Over: %s, Winner: %s.", self.room_id, self.game_over, self.winner)
                 
                 # End turn if criteria met
-                print(f"Evaluating turn end conditions: turn_ends={turn_ends}, game_over={self.game_over}, guesses_made={self.guesses_made}, clue_number={self.clue_number}.")
+                logger.debug("Evaluating turn end conditions: turn_ends=%s, game_over=%s, guesses_made=%s, clue_number=%s.", turn_ends, self.game_over, self.guesses_made, self.clue_number)
                 if turn_ends or self.game_over or self.guesses_made > self.clue_number:
-                    print(f"Calling _end_turn().")
+                    logger.debug("Calling _end_turn().")
                     self._end_turn()
                 else:
-                    print(f"Turn continues.")
+                    logger.debug("Turn continues.")
 
-            print(f"--- Exiting process_guess. Result: True, Message: '{result_message}' ---")
+            logger.debug("--- Exiting process_guess. Result: True, Message: '%s' ---", result_message)
             return True, result_message
 
     def _end_turn(self):
-        with self.lock:
-            if self.game_over: return
-            print(f"Room {self.room_id}: {self.turn.upper()}'s turn ends.")
-            self.add_chat_message(f"{self.turn.upper()}'s turn has ended.", is_system=True)
+        """Hands the turn to the other team. Caller holds the lock."""
+        if self.game_over: return
+        self._mark_state_changed()
+        logger.info("Room %s: %s's turn ends.", self.room_id, self.turn.upper())
+        self._append_chat_message(f"{self.turn.upper()}'s turn has ended.", is_system=True)
             
-            # Clear clue for next turn
-            self.clue_word = ""
-            self.clue_number = 0
-            self.guesses_made = 0
-            # Switch turn
-            self.turn = "blue" if self.turn == "red" else "red"
+        # Clear clue for next turn
+        self.clue_word = ""
+        self.clue_number = 0
+        self.guesses_made = 0
+        # Switch turn
+        self.turn = "blue" if self.turn == "red" else "red"
+        self._update_current_turn_operatives()
+
+    def _update_current_turn_operatives(self):
+        """Points _current_turn_operatives at the operatives of the team on turn, after the turn or teams change."""
+        self._current_turn_operatives = self.red_operatives_filenos if self.turn == "red" else self.blue_operatives_filenos
 
     def process_end_turn(self, client_fileno):
         with self.lock:
             if self.game_over: return False, "Game is already over."
             if not self.game_in_progress: return False, "Game not in progress."
 
-            is_operative_of_current_team = False
-            if self.turn == "red" and client_fileno in self.red_operatives_filenos:
-                is_operative_of_current_team = True
-            elif self.turn == "blue" and client_fileno in self.blue_operatives_filenos:
-                is_operative_of_current_team = True
-
-            if not is_operative_of_current_team:
+            if client_fileno not in self._current_turn_operatives:
                 return False, "It's not your team's turn or you are not an operative for the current turn."
             
             if not self.clue_word: # Can't end turn if no clue was given yet
                 return False, "No clue has been given yet."
 
             self._end_turn()
-            self.add_chat_message(f"{self.clients.get(client_fileno, 'Unknown')} explicitly ended turn.")
-            print(f"Room {self.room_id}: {self.clients.get(client_fileno, 'Unknown')} explicitly ended turn.")
+            name = self.clients.get(client_fileno, 'Unknown')
+            self._append_chat_message(f"{name} explicitly ended turn.")
+            logger.info("Room %s: %s explicitly ended turn.", self.room_id, name)
             return True, "Turn ended."
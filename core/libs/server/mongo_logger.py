@@ -1,42 +1,82 @@
 import socket
 import threading
 import json
+import logging
+import queue
 import time
 import random
 import traceback
 import select
 import pymongo
-from datetime import datetime
+from datetime import datetime, timezone
+
+logger = logging.getLogger("codenames.server")
+
+# --- Constants ---
+LOG_BATCH_SIZE = 200 # Max events written by one insert_many
+LOG_BATCH_WAIT = 0.1 # Seconds the writer waits for more events before writing a partial batch
+LOG_SOCKET_TIMEOUT_MS = 5000 # A stalled insert fails instead of hanging the writer (and close()) forever
 
 # --- MongoDB Logger Class (Updated for localhost connection) ---
 class MongoLogger:
     """Handles logging server events to a MongoDB database."""
     def __init__(self, db_host='localhost', db_port=27017, db_name='codenames_monitor', collection_name='server_events'):
         try:
-            self.client = pymongo.MongoClient(f"mongodb://{db_host}:{db_port}/", serverSelectionTimeoutMS=5000)
+            # Only the writer thread talks to the database, so one pooled connection is enough
+            self.client = pymongo.MongoClient(f"mongodb://{db_host}:{db_port}/", serverSelectionTimeoutMS=5000,
+                                              maxPoolSize=1, socketTimeoutMS=LOG_SOCKET_TIMEOUT_MS)
             self.client.admin.command('ping')
             self.db = self.client[db_name]
             self.collection = self.db[collection_name]
-            print("Successfully connected to MongoDB.")
+            logger.info("Successfully connected to MongoDB.")
+            # Events are written in batches by a background thread so callers never wait on the database
+            self._queue = queue.SimpleQueue()
+            self._writer = threading.Thread(target=self._write_events, daemon=True)
+            self._writer.start()
         except pymongo.errors.ConnectionFailure as e:
-            print(f"Could not connect to MongoDB: {e}")
+            logger.warning("Could not connect to MongoDB: %s", e)
             self.client = None
         except Exception as e:
-            print(f"An unexpected error occurred during MongoDB connection: {e}")
+            logger.warning("An unexpected error occurred during MongoDB connection: %s", e)
             self.client = None
 
     def log_event(self, event_type, details):
-        """Logs an event to the database if the connection is active."""
-
-
-        print("event to the database")
+        """Queues an event for the database if the connection is active."""
+        logger.debug("Queued %s event for the database", event_type)
         if self.client:
-            log_entry = {
-                "tz":time.strftime("%I:%M%p on %B %d, %Y"),
+            self._queue.put({
+                "tz": datetime.now(timezone.utc), # Time of the event, not of the write; stored as a BSON date
                 "event_type": event_type,
                 "details": details
-            }
+            })
+
+    def close(self):
+        """Writes any queued events and stops the writer thread."""
+        if self.client:
+            self._queue.put(None)
+            self._writer.join()
+
+    def _write_events(self):
+        """Writer thread: collects queued events into batches and inserts each batch at once."""
+        while True:
+            log_entry = self._queue.get()
+            if log_entry is None:
+                return
+            batch = [log_entry]
+            deadline = time.monotonic() + LOG_BATCH_WAIT
+            stop = False
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    log_entry = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if log_entry is None:
+                    stop = True
+                    break
+                batch.append(log_entry)
             try:
-                self.collection.insert_one(log_entry)
+                self.collection.insert_many(batch, ordered=False)
             except Exception as e:
-                print(f"Error logging event to MongoDB: {e}")
+                logger.error("Error logging %s events to MongoDB: %s", len(batch), e)
+            if stop:
+                return
@@ -13,11 +13,13 @@ from gameRoom import GameRoom
 # --- Constants ---
 HOST = '127.0.0.1'
 PORT = 5555
-HEADER_LENGTH = 10
+HEADER_LENGTH = 4
 
 
 class Player:
     """Represents a player connected to the server."""
+    __slots__ = ("fileno", "name", "room_id", "team", "role", "chosen_team") # No per-instance __dict__
+
     def __init__(self, fileno, name):
         self.fileno = fileno
         self.name = name
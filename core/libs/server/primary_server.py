@@ -1,6 +1,7 @@
 import socket
 import threading
 import json
+import struct
 import time
 import random
 import traceback
@@ -9,7 +10,8 @@ import select # Import the select module
 # --- Constants ---
 HOST = '127.0.0.1'
 PORT = 5555
-HEADER_LENGTH = 10 # For fixed-size message length header
+HEADER_STRUCT = struct.Struct("!I") # Message length as a 4-byte big-endian unsigned int
+HEADER_LENGTH = HEADER_STRUCT.size
 
 # --- Game Logic (Simplified Codenames Board) ---
 # A basic list of words for demonstration. In a full game, this would be much larger.
@@ -628,34 +630,34 @@ class CodenamesServer:
                 return
             client_sock = client_info["socket"]
 
+        rxbuf = bytearray() # Bytes of a frame that has not fully arrived yet, kept between reads
         try:
             while self.running:
                 # Use select to wait for data to be available for reading
                 # Timeout of 0.1 seconds to allow the loop to check self.running regularly
                 readable, _, _ = select.select([client_sock], [], [], 0.1)
                 if client_sock in readable:
-                    # Read header first
-                    header = client_sock.recv(HEADER_LENGTH)
-                    if not header: # Client disconnected
+                    # The socket is non-blocking, so a read returns whatever has arrived:
+                    # part of a frame, or several frames at once
+                    try:
+                        chunk = client_sock.recv(4096)
+                    except BlockingIOError:
+                        continue
+                    if not chunk: # Client disconnected
                         print(f"Client {client_fileno} disconnected.")
                         break
-                    
-                    msg_len = int(header.decode('utf-8').strip())
-                    
-                    # Read the full message body
-                    full_message_bytes = b''
-                    while len(full_message_bytes) < msg_len:
-                        chunk = client_sock.recv(msg_len - len(full_message_bytes))
-                        if not chunk: # Client disconnected during body read
-                            print(f"Client {client_fileno} disconnected during message body read.")
+                    rxbuf += chunk
+
+                    # Handle every complete frame; a partial one waits for the next read
+                    while len(rxbuf) >= HEADER_LENGTH:
+                        (msg_len,) = HEADER_STRUCT.unpack_from(rxbuf)
+                        frame_end = HEADER_LENGTH + msg_len
+                        if len(rxbuf) < frame_end:
                             break
-                        full_message_bytes += chunk
-                    
-                    if len(full_message_bytes) < msg_len: # Incomplete message
-                        break # Disconnect client or handle as error
-                    
-                    message = json.loads(full_message_bytes.decode('utf-8'))
-                    self._process_message(client_fileno, message)
+                        full_message_bytes = bytes(rxbuf[HEADER_LENGTH:frame_end])
+                        del rxbuf[:frame_end]
+                        message = json.loads(full_message_bytes.decode('utf-8'))
+                        self._process_message(client_fileno, message)
                 # If not readable, loop continues and checks self.running
         except ConnectionResetError:
             print(f"Client {client_fileno} connection reset by peer.")
@@ -886,7 +888,7 @@ class CodenamesServer:
                 try:
                     data = json.dumps(message).encode('utf-8')
                     # Prepend header with message length
-                    header = f"{len(data):<{HEADER_LENGTH}}".encode('utf-8')
+                    header = HEADER_STRUCT.pack(len(data))
                     client_info["socket"].sendall(header + data)
                 except Exception as e:
                     print(f"Error sending to client {client_fileno}: {e}")
@@ -1,5 +1,6 @@
 import pytest
 import json
+import struct
 import pygame
 
 # Import the CodenamesClient class from your client module
@@ -35,7 +36,7 @@ class DummySocket:
 # Helper function to create an encoded message for the DummySocket
 def _create_message(message_dict):
     encoded = json.dumps(message_dict).encode('utf-8')
-    header = f"{len(encoded):<10}".encode('utf-8')
+    header = struct.pack("!I", len(encoded))
     return header + encoded
 
 # Test initial client state and UI elements
@@ -134,7 +135,7 @@ def test_send_login_message():
     assert client.logged_in is True
     assert len(client.client.send_buffer) == 1
 
-    sent_msg_body = json.loads(client.client.send_buffer[0][10:].decode('utf-8'))
+    sent_msg_body = json.loads(client.client.send_buffer[0][4:].decode('utf-8'))
     assert sent_msg_body["type"] == "login"
     assert sent_msg_body["name"] == "TestPlayer"
 
@@ -150,7 +151,7 @@ def test_send_create_room():
     client._send_create_room()
     assert len(client.client.send_buffer) == 1
 
-    sent_msg_body = json.loads(client.client.send_buffer[0][10:].decode('utf-8'))
+    sent_msg_body = json.loads(client.client.send_buffer[0][4:].decode('utf-8'))
     assert sent_msg_body["type"] == "create_room"
     assert sent_msg_body["name"] == "My New Room"
 
@@ -168,7 +169,7 @@ def test_send_join_room():
     assert client.current_room_id == room_id_to_join
     assert len(client.client.send_buffer) == 1
 
-    sent_msg_body = json.loads(client.client.send_buffer[0][10:].decode('utf-8'))
+    sent_msg_body = json.loads(client.client.send_buffer[0][4:].decode('utf-8'))
     assert sent_msg_body["type"] == "join_room"
     assert sent_msg_body["room_id"] == room_id_to_join
 
@@ -186,7 +187,7 @@ def test_send_leave_room():
     assert client.current_room_id is None
     assert len(client.client.send_buffer) == 1
 
-    sent_msg_body = json.loads(client.client.send_buffer[0][10:].decode('utf-8'))
+    sent_msg_body = json.loads(client.client.send_buffer[0][4:].decode('utf-8'))
     assert sent_msg_body["type"] == "leave_room"
     assert sent_msg_body["room_id"] == "room_xyz"
 
@@ -243,7 +244,7 @@ def test_send_clue_sends_correct_message_when_valid():
     client._send_clue()
 
     assert len(client.client.send_buffer) == 1
-    sent_msg_body = json.loads(client.client.send_buffer[0][10:].decode('utf-8'))
+    sent_msg_body = json.loads(client.client.send_buffer[0][4:].decode('utf-8'))
     assert sent_msg_body["type"] == "clue"
     assert sent_msg_body["clue_word"] == "TESTWORD"
     assert sent_msg_body["clue_number"] == 2
@@ -265,7 +266,7 @@ def test_send_guess_sends_correct_message_when_valid():
     client._send_guess(word_to_guess)
     
     assert len(client.client.send_buffer) == 1
-    sent_msg_body = json.loads(client.client.send_buffer[0][10:].decode('utf-8'))
+    sent_msg_body = json.loads(client.client.send_buffer[0][4:].decode('utf-8'))
     assert sent_msg_body["type"] == "guess"
     assert sent_msg_body["word"] == word_to_guess
 
@@ -281,7 +282,7 @@ def test_send_room_chat_message():
     client._send_chat_message()
 
     assert len(client.client.send_buffer) == 1
-    sent_msg_body = json.loads(client.client.send_buffer[0][10:].decode('utf-8'))
+    sent_msg_body = json.loads(client.client.send_buffer[0][4:].decode('utf-8'))
     assert sent_msg_body["type"] == "chat_message"
     assert sent_msg_body["room_id"] == "room_1"
     assert sent_msg_body["text"] == "Hello team!"
@@ -1,6 +1,9 @@
 import pytest
 from unittest.mock import patch, MagicMock, call
 import json
+import struct
+import zlib
+import pygame
 
 
 import sys
@@ -13,6 +16,7 @@ core_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'core/l
 sys.path.append(core_dir)
 
 from codenames_client import CodenamesClient, InputBox
+from textCache import render_text
 
 
 
@@ -35,6 +39,11 @@ class DummySocket:
             return chunk
         return b''  # simulate closed connection
 
+    def recv_into(self, buffer, nbytes=0):
+        chunk = self.recv(nbytes or len(buffer))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
     def close(self):
         self.closed = True
 
@@ -60,7 +69,7 @@ def test_receive_message_receives_valid_json(monkeypatch):
     # Prepare message header and body
     test_msg = {"type": "lobby_update", "players": ["Alice"], "rooms": [], "chat": []}
     encoded = json.dumps(test_msg).encode('utf-8')
-    header = f"{len(encoded):<10}".encode('utf-8')
+    header = struct.pack("!I", len(encoded))
 
     dummy_socket = DummySocket(recv_messages=[header, encoded])
     client = CodenamesClient()
@@ -79,6 +88,32 @@ def test_receive_message_disconnect():
     msg = client._receive_message()
     assert msg is None
 
+# Test frames split across recv calls, or batched into one, are reassembled
+def test_receive_message_reassembles_split_frames():
+    frames = []
+    for msg_type in ("lobby_update", "game_start_ack"):
+        encoded = json.dumps({"type": msg_type}).encode('utf-8')
+        frames.append(struct.pack("!I", len(encoded)) + encoded)
+
+    dummy_socket = DummySocket(recv_messages=[frames[0] + frames[1][:5], frames[1][5:]])
+    client = CodenamesClient()
+    client.client = dummy_socket
+
+    assert client._receive_message()["type"] == "lobby_update"
+    assert client._receive_message()["type"] == "game_start_ack"
+    assert client._receive_message() is None
+
+# Test a body flagged as compressed in the header is inflated before decoding
+def test_receive_message_decompresses_flagged_frames():
+    encoded = zlib.compress(json.dumps({"type": "game_state_update", "board": []}).encode('utf-8'))
+    header = struct.pack("!I", len(encoded) | 0x80000000)
+
+    dummy_socket = DummySocket(recv_messages=[header + encoded])
+    client = CodenamesClient()
+    client.client = dummy_socket
+
+    assert client._receive_message() == {"type": "game_state_update", "board": []}
+
 # Test handling lobby_update message updates client state properly
 def test_handle_lobby_update_message():
     client = CodenamesClient()
@@ -94,6 +129,27 @@ def test_handle_lobby_update_message():
     assert len(client.lobby_rooms) == 1
     assert client.lobby_chat == ["Welcome to lobby"]
 
+# Test a game_state_delta only patches the changed fields and cards of the last snapshot
+def test_game_state_delta_patches_last_snapshot():
+    client = CodenamesClient()
+    snapshot = {
+        "type": "game_state_update",
+        "board": [{"word": "APPLE", "revealed": False}, {"word": "BAKER", "revealed": False}],
+        "red_score": 8, "blue_score": 8, "turn": "red", "clue_word": "", "clue_number": 0,
+        "guesses_made": 0, "game_over": False, "winner": None, "is_spymaster": False,
+        "spymaster_red": 1, "spymaster_blue": 2, "operative_red": [1, 3], "operative_blue": [2, 4],
+        "my_team": "red", "my_role": "operative"
+    }
+    client._handle_message(snapshot)
+    client._handle_message({"type": "game_state_delta", "changes": {"red_score": 7},
+                            "cards": [[1, {"word": "BAKER", "color": "red", "revealed": True}]]})
+
+    assert client.red_score == 7
+    assert client.current_turn == "red"
+    assert client.game_board[0] == {"word": "APPLE", "revealed": False}
+    assert client.game_board[1]["revealed"] is True
+    assert snapshot["board"][1]["revealed"] is False  # the earlier snapshot is left untouched
+
 # Test resetting connection state clears important fields and closes socket
 def test_reset_connection_state_closes_socket():
     client = CodenamesClient()
@@ -126,6 +182,67 @@ def test_input_box_text_update():
     input_box.clear_text()
     assert input_box.get_text() == ''
 
+# Test keys that type nothing leave the text alone and don't force a re-render
+def test_input_box_ignores_non_text_keys():
+    input_box = InputBox(0, 0, 100, 30)
+    input_box.active = True
+    input_box.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, unicode='a'))
+    input_box.draw(pygame.Surface((200, 50)))
+
+    input_box.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_LSHIFT, unicode=''))
+    input_box.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_TAB, unicode='\t'))
+    assert input_box.get_text() == 'a'
+    assert input_box._dirty is False
+
+# Test identical text is rendered once and served from the cache afterwards
+def test_render_text_reuses_cached_surface():
+    font = pygame.font.SysFont('Comic Sans', 20)
+    first = render_text(font, "Codenames Lobby", (220, 220, 230))
+    assert render_text(font, "Codenames Lobby", (220, 220, 230)) is first
+    assert render_text(font, "Codenames Lobby", (255, 255, 255)) is not first
+
+# Test the static lobby layer is only re-rendered after the lobby changes
+def test_lobby_background_rebuilt_only_when_dirty():
+    client = CodenamesClient()
+    client._draw_lobby((0, 0))
+    background = client._lobby_bg_surface
+    assert client._dirty_rects is None  # first frame repaints the whole window
+
+    client._draw_lobby((0, 0))
+    assert client._lobby_bg_surface is background
+    assert client._dirty_rects  # later frames only update the widgets
+
+    client._handle_message({"type": "lobby_update", "players": ["Bob"], "rooms": [], "chat": []})
+    client._draw_lobby((0, 0))
+    assert client._lobby_bg_surface is not background
+
+# Test every room gets a Join button, the pool grows instead of cutting the list short
+def test_lobby_lists_every_room():
+    client = CodenamesClient()
+    rooms = [{"id": f"room_{i}", "name": "Room", "players": 1, "game_in_progress": False, "owner": "Danial", "owner_fileno": 1}
+             for i in range(12)]
+    client._handle_message({"type": "lobby_update", "players": [], "rooms": rooms, "chat": []})
+    ui_elements = client._draw_lobby((0, 0))
+
+    join_buttons = [element for element in ui_elements if element in client.join_buttons]
+    assert len(join_buttons) == 12
+    assert join_buttons[-1].is_enabled
+    client._send_message = MagicMock()
+    join_buttons[-1].action()
+    client._send_message.assert_called_once_with({"type": "join_room", "room_id": "room_11"})
+
+# Test a click on an unrevealed card sends one guess for its word, and a revealed card is ignored
+def test_card_click_sends_guess_for_unrevealed_card():
+    client = CodenamesClient()
+    client.game_board = [{"word": "APPLE", "revealed": False}, {"word": "BAKER", "revealed": True}]
+    client._send_message = MagicMock()
+
+    client._handle_card_click(client._card_rects[1].center)
+    client._send_message.assert_not_called()
+
+    client._handle_card_click(client._card_rects[0].center)
+    client._send_message.assert_called_once_with({"type": "guess", "word": "APPLE"})
+
 # Test _send_set_team does not send if game is active or no room
 def test_send_set_team_restricted():
     client = CodenamesClient()
@@ -0,0 +1,156 @@
+import pytest
+from unittest.mock import patch
+import json
+import select
+import socket
+import struct
+import time
+import types
+
+
+import sys
+import os
+
+# Get the absolute path for the ../core/libs/server folder relative to this script
+server_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'core/libs/server'))
+
+# Add the server directory to sys.path to make it importable
+sys.path.append(server_dir)
+
+import codenamesServer_class
+from codenamesServer_class import CodenamesServer, MAX_OUTBOX_BYTES, _encode_frame
+from gameRoom import GameRoom, FULL_SYNC_INTERVAL
+from player import Player
+
+
+
+# Wraps a server-side client socket and only accepts `limit` bytes per send, like a full socket buffer
+class ThrottledSocket:
+    def __init__(self, sock, limit):
+        self.sock = sock
+        self.limit = limit
+        self.sent = bytearray()
+
+    def fileno(self):
+        return self.sock.fileno()  # The selector looks the registration up by fileno
+
+    def sendmsg(self, buffers):
+        data = b"".join(buffers)[:self.limit]
+        self.sent += data
+        return len(data)
+
+    def send(self, data):
+        return self.sendmsg([data])
+
+    def close(self):
+        self.sock.close()
+
+# Server on an ephemeral port, with the MongoDB logger replaced
+@pytest.fixture
+def server():
+    with patch.object(codenamesServer_class, "MongoLogger"):
+        srv = CodenamesServer('127.0.0.1', 0)
+    yield srv
+    srv.stop()
+
+# Connects a peer socket and lets the server accept it, returns (server-side fileno, peer socket)
+def _connect(server):
+    peer = socket.create_connection(server.sock.getsockname())
+    for _ in range(100):
+        server._accept_connections()
+        if server.clients:
+            break
+        time.sleep(0.01)
+    (fileno,) = server.clients
+    return fileno, peer
+
+# Waits until the server-side socket has data, then lets the server read it
+def _deliver(server, fileno, data, peer):
+    peer.sendall(data)
+    select.select([server.clients[fileno]["socket"]], [], [], 1)
+    server._read_from_client(fileno)
+
+def _frame(message):
+    encoded = json.dumps(message).encode('utf-8')
+    return struct.pack("!I", len(encoded)) + encoded
+
+# Test frames split across reads, or several in one read, are each processed once complete
+def test_read_from_client_reassembles_split_and_batched_frames(server):
+    fileno, peer = _connect(server)
+    data = _frame({"type": "join", "name": "Alice"}) + _frame({"type": "chat", "text": "hi"})
+    split = len(data) - 5  # Inside the chat frame's body
+
+    _deliver(server, fileno, data[:2], peer)  # Not even a whole header yet
+    assert server.connected_clients[fileno].name == f"Guest_{fileno}"
+
+    _deliver(server, fileno, data[2:split], peer)
+    assert server.connected_clients[fileno].name == "Alice"
+    assert "Alice: hi" not in server.lobby_chat
+
+    _deliver(server, fileno, data[split:], peer)
+    assert "Alice: hi" in server.lobby_chat
+    assert server.clients[fileno]["rxbuf"] == b""
+    peer.close()
+
+# Test a client announcing a compressed or oversized frame is dropped instead of buffered
+def test_read_from_client_drops_oversized_frames(server):
+    fileno, peer = _connect(server)
+    _deliver(server, fileno, struct.pack("!I", 0x80000010) + b"x" * 16, peer)
+    assert fileno not in server.clients
+    peer.close()
+
+# Test a partly sent outbox resumes at the right byte and stops watching EVENT_WRITE once empty
+def test_flush_outbox_resumes_after_partial_send(server):
+    fileno, peer = _connect(server)
+    client_info = server.clients[fileno]
+    throttled = ThrottledSocket(client_info["socket"], limit=7)
+    client_info["socket"] = throttled
+    first, second = _encode_frame({"type": "info", "message": "a" * 20}), _encode_frame({"type": "info", "message": "b"})
+
+    server._send_frame(fileno, first)
+    server._send_frame(fileno, second)
+    assert client_info["outbox_offset"] == 7 - len(first[0])  # Header sent, body cut after 3 bytes
+    assert server._sel.get_key(throttled).events & codenamesServer_class.selectors.EVENT_WRITE
+
+    while client_info["outbox"]:
+        server._flush_outbox(fileno)
+    assert bytes(throttled.sent) == b"".join(first + second)
+    assert client_info["outbox_bytes"] == 0
+    assert server._sel.get_key(throttled).events == codenamesServer_class.selectors.EVENT_READ
+    peer.close()
+
+# Test a client that stops reading is disconnected once its outbox passes MAX_OUTBOX_BYTES
+def test_send_frame_drops_client_over_outbox_limit(server):
+    fileno, peer = _connect(server)
+    server.clients[fileno]["socket"] = ThrottledSocket(server.clients[fileno]["socket"], limit=0)
+
+    server._send_frame(fileno, (b"", b"x" * MAX_OUTBOX_BYTES))
+    assert fileno in server.clients  # Exactly at the limit is still tolerated
+    server._send_frame(fileno, (b"", b"x"))
+    assert fileno not in server.clients
+    peer.close()
+
+# Test a game state update is a full snapshot, then deltas, then a full snapshot again after FULL_SYNC_INTERVAL deltas
+def test_game_state_update_sends_deltas_between_full_syncs():
+    players = {fileno: Player(fileno, f"P{fileno}") for fileno in (1, 2, 3, 4)}
+    room = GameRoom("room_1", 1, types.SimpleNamespace(connected_clients=players))
+    for fileno, player in players.items():
+        room.add_client(fileno, player.name)
+    room.start_game()
+
+    assert room.get_game_state_update_for_client(1)["type"] == "game_state_update"
+    assert room.get_game_state_update_for_client(1) is None  # Nothing changed
+
+    spymaster = room.red_spymaster_fileno if room.turn == "red" else room.blue_spymaster_fileno
+    assert room.process_clue(spymaster, "ocean", 2)[0]
+    delta = room.get_game_state_update_for_client(1)
+    assert delta == {"type": "game_state_delta", "changes": {"clue_word": "OCEAN", "clue_number": 2}, "cards": []}
+
+    for guesses in range(1, FULL_SYNC_INTERVAL):
+        assert room.get_game_state_update_for_client(1) is None  # Polls that send nothing don't count
+        room.guesses_made = guesses
+        room._mark_state_changed()
+        assert room.get_game_state_update_for_client(1)["type"] == "game_state_delta"
+    room.guesses_made = 0
+    room._mark_state_changed()
+    assert room.get_game_state_update_for_client(1)["type"] == "game_state_update"